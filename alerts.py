@@ -0,0 +1,131 @@
+# Threshold alerting over telemetry and zone metrics
+#
+# Rules compile to vectorized masks evaluated over every entity (station or
+# zone) at once. Alert state is one boolean per (rule, entity), which dedups
+# repeats; a hysteresis band and a re-arm cooldown keep alerts from flapping.
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from kpis import SANS_241_LIMITS
+
+SEVERITY_ORDER = {'critical': 0, 'warning': 1}
+
+
+def _limits(parameter):
+    row = SANS_241_LIMITS.set_index('Parameter').loc[parameter]
+    return row['Lower_Limit'], row['Upper_Limit'], row['Lower_Target'], row['Upper_Target']
+
+
+class AlertRule:
+    """Fires when `metric` leaves [low, high]; clears once back inside by `hysteresis`."""
+
+    def __init__(self, name, metric, low=None, high=None, hysteresis=0.0, severity='warning', message=''):
+        self.name = name
+        self.metric = metric
+        self.low = -np.inf if low is None or pd.isna(low) else low
+        self.high = np.inf if high is None or pd.isna(high) else high
+        self.hysteresis = hysteresis
+        self.severity = severity
+        self.message = message
+
+    def compile(self):
+        low, high, margin = self.low, self.high, self.hysteresis
+
+        def masks(values):
+            # NaN compares False on both sides, so missing readings hold state
+            trigger = (values < low) | (values > high)
+            clear = (values >= low + margin) & (values <= high - margin)
+            return trigger, clear
+
+        return masks
+
+    def format(self, value):
+        # `message` may use {value}, {low} and {high}, so the text follows the limits
+        return self.message.format(value=value, low=self.low, high=self.high)
+
+
+STATION_RULES = [
+    AlertRule('Low pressure', 'Pressure_kPa', low=50, hysteresis=10, severity='critical',
+              message='Pressure {value:.0f} kPa below {low:.0f} kPa'),
+    AlertRule('Chlorine out of range', 'Chlorine_mg_L', low=_limits('Free Chlorine')[0], high=_limits('Free Chlorine')[3],
+              hysteresis=0.05, message='Free chlorine {value:.2f} mg/L outside {low:g}–{high:g} mg/L'),
+    AlertRule('pH out of SANS 241 range', 'pH_Level', low=_limits('pH Levels')[0], high=_limits('pH Levels')[1],
+              hysteresis=0.1, severity='critical', message='pH {value:.2f} outside SANS 241 {low:.1f}–{high:.1f}'),
+]
+
+ZONE_RULES = [
+    AlertRule('High leakage', 'Leakage_Ml', high=20, hysteresis=2, severity='critical',
+              message='{value:.0f} Ml/month leakage'),
+]
+
+
+class AlertEngine:
+    """Active-alert state for a fixed set of entities (stations or zones)."""
+
+    def __init__(self, rules, entity_ids, entity_zones=None, cooldown_s=300.0):
+        self.rules = list(rules)
+        self._masks = [rule.compile() for rule in self.rules]
+        self.entity_ids = np.asarray(entity_ids)
+        self.entity_zones = np.asarray(entity_zones if entity_zones is not None else entity_ids)
+        self.cooldown_s = cooldown_s
+
+        shape = (len(self.rules), len(self.entity_ids))
+        self.active = np.zeros(shape, dtype=bool)
+        self.since = np.full(shape, np.nan)
+        self.cleared_at = np.full(shape, -np.inf)
+        self.values = np.full(shape, np.nan)
+        self.raised_total = 0
+        self.evaluations = 0
+        self._lock = threading.Lock()
+
+    def evaluate(self, metrics, now=None):
+        # metrics: {metric: array aligned with entity_ids}; returns newly raised count
+        now = time.time() if now is None else now
+        with self._lock:
+            raised = 0
+            for i, (rule, masks) in enumerate(zip(self.rules, self._masks)):
+                values = metrics.get(rule.metric)
+                if values is None:
+                    continue
+                values = np.asarray(values, dtype=np.float64)
+                trigger, clear = masks(values)
+                # Re-arm only after the cooldown, so a value bouncing on the threshold
+                # does not raise a fresh alert every refresh
+                trigger &= (now - self.cleared_at[i]) >= self.cooldown_s
+                active = self.active[i]
+                new_active = (active & ~clear) | trigger
+
+                started_now = new_active & ~active
+                ended_now = active & ~new_active
+                self.since[i, started_now] = now
+                self.since[i, ended_now] = np.nan
+                self.cleared_at[i, ended_now] = now
+                self.values[i] = np.where(new_active, values, np.nan)
+                self.active[i] = new_active
+                raised += int(started_now.sum())
+
+            self.raised_total += raised
+            self.evaluations += 1
+        return raised
+
+    def active_alerts(self, zones=None, limit=None):
+        with self._lock:
+            rule_index, entity_index = np.nonzero(self.active)
+            values = self.values[rule_index, entity_index]
+            since = self.since[rule_index, entity_index]
+        alerts = pd.DataFrame({
+            'Rule': [self.rules[i].name for i in rule_index],
+            'Severity': [self.rules[i].severity for i in rule_index],
+            'Entity': self.entity_ids[entity_index],
+            'Zone': self.entity_zones[entity_index],
+            'Value': values,
+            'Since': pd.to_datetime(since, unit='s'),
+            'Message': [self.rules[r].format(v) for r, v in zip(rule_index, values)],
+        })
+        if zones is not None:
+            alerts = alerts[alerts['Zone'].isin(zones)]
+        alerts = alerts.sort_values(['Severity', 'Since'], key=lambda c: c.map(SEVERITY_ORDER) if c.name == 'Severity' else c)
+        return alerts.head(limit) if limit is not None else alerts
@@ -0,0 +1,228 @@
+# Time-partitioned historical archive
+#
+# The monthly frames are kept on disk as Parquet parts partitioned by month
+# (and by zone where the frame has one), with a JSON manifest recording each
+# part's row count and per-column min/max. A date_range query reads the
+# manifest, prunes every part outside the window and reads only the needed
+# columns of the rest, so decades of history never have to sit in RAM.
+# Appends add new parts and never rewrite existing ones.
+#
+#   <root>/<frame>/month=2024-01/zone=Soweto_North/part-000042.parquet
+#   <root>/<frame>/_manifest.json
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data_sources import ZONE_COLUMNS, DataSource
+from schema import conform_table
+
+ARCHIVED_FRAMES = ('water_security', 'financial_data', 'customer_impact')
+
+
+def _window(date_range):
+    # [start, end) in epoch ns; the end date is inclusive, as in DataSource.load
+    if date_range is None:
+        return None, None
+    start, end = date_range
+    return (
+        None if start is None else pd.Timestamp(start).value,
+        None if end is None else (pd.Timestamp(end) + pd.Timedelta(days=1)).value,
+    )
+
+
+def _bound(value):
+    # JSON-safe statistic: datetimes as epoch ns, numbers as float
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return int(pd.Timestamp(value).value)
+    return float(value)
+
+
+class Archive:
+    """Month (x zone) partitioned Parquet store with a min/max manifest."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def manifest_path(self, name):
+        return self.root / name / '_manifest.json'
+
+    def manifest(self, name):
+        path = self.manifest_path(name)
+        if not path.exists():
+            return {'version': 0, 'next_part': 0, 'parts': []}
+        mtime = path.stat().st_mtime_ns
+        cached = self._manifests.get(name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, json.loads(path.read_text()))
+            self._manifests[name] = cached
+        return cached[1]
+
+    def max_date(self, name):
+        parts = self.manifest(name)['parts']
+        return pd.Timestamp(max(part['stats']['Date'][1] for part in parts)) if parts else None
+
+    def append(self, name, frame):
+        # Writes one new part per (month, zone) in `frame`; returns rows added
+        if frame.empty:
+            return 0
+        zone_column = ZONE_COLUMNS.get(name)
+        months = pd.DatetimeIndex(frame['Date']).to_period('M').astype(str)
+        keys = [months] + ([frame[zone_column].astype(str)] if zone_column in frame.columns else [])
+
+        with self._lock:
+            manifest = dict(self.manifest(name))
+            parts = list(manifest['parts'])
+            next_part = manifest['next_part']
+            for key, group in frame.groupby(keys, sort=True, observed=True):
+                month, zone = (key, None) if len(keys) == 1 else key
+                month = month[0] if isinstance(month, tuple) else month
+                directory = f'month={month}' + (f'/zone={zone}' if zone is not None else '')
+                path = f'{directory}/part-{next_part:06d}.parquet'
+                next_part += 1
+
+                table = conform_table(name, pa.Table.from_pandas(group.sort_values('Date'), preserve_index=False))
+                (self.root / name / directory).mkdir(parents=True, exist_ok=True)
+                pq.write_table(table, self.root / name / path)
+
+                numeric = group.select_dtypes(include=['number', 'datetime']).columns
+                parts.append({
+                    'path': path,
+                    'month': month,
+                    'zone': zone,
+                    'rows': len(group),
+                    'stats': {column: [_bound(group[column].min()), _bound(group[column].max())] for column in numeric},
+                })
+
+            manifest = {'version': manifest['version'] + 1, 'next_part': next_part, 'parts': parts}
+            # The manifest swap is what publishes the new parts to readers
+            path = self.manifest_path(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.with_suffix('.tmp').write_text(json.dumps(manifest))
+            os.replace(path.with_suffix('.tmp'), path)
+        return len(frame)
+
+    def prune(self, name, date_range=None, zones=None):
+        # Parts that can hold rows in the window, and whether each lies fully inside it
+        start, end = _window(date_range)
+        wanted = None if zones is None else set(zones)
+        selected = []
+        for part in self.manifest(name)['parts']:
+            low, high = part['stats']['Date']
+            if (start is not None and high < start) or (end is not None and low >= end):
+                continue
+            if wanted is not None and part['zone'] is not None and part['zone'] not in wanted:
+                continue
+            inside = (start is None or low >= start) and (end is None or high < end)
+            selected.append((part, inside))
+        return selected
+
+    def query(self, name, columns=None, date_range=None, zones=None):
+        selected = self.prune(name, date_range, zones)
+        start, end = _window(date_range)
+        if columns is not None and 'Date' not in columns:
+            columns = ['Date', *columns]
+        tables = []
+        for part, inside in selected:
+            table = pq.read_table(self.root / name / part['path'], columns=columns)
+            if not inside:
+                # Only boundary months need a row-level date filter; bounds
+                # take the column's own unit (parts may hold timestamp[us])
+                dates = table['Date']
+                keep = pa.array(np.ones(len(table), dtype=bool))
+                if start is not None:
+                    keep = pc.and_(keep, pc.greater_equal(dates, pa.scalar(pd.Timestamp(start), type=dates.type)))
+                if end is not None:
+                    keep = pc.and_(keep, pc.less(dates, pa.scalar(pd.Timestamp(end), type=dates.type)))
+                table = table.filter(keep)
+            tables.append(table)
+        if not tables:
+            parts = self.manifest(name)['parts']
+            if not parts:
+                return None
+            schema = pq.read_schema(self.root / name / parts[0]['path'])
+            schema = pa.schema([schema.field(c) for c in (columns or schema.names) if c in schema.names])
+            return schema.empty_table()
+        return pa.concat_tables(tables).sort_by('Date')
+
+    def stats(self, name):
+        parts = self.manifest(name)['parts']
+        return {'parts': len(parts), 'rows': sum(part['rows'] for part in parts), 'months': len({part['month'] for part in parts})}
+
+
+class ArchiveSource(DataSource):
+    """Backend serving ARCHIVED_FRAMES from an Archive and the rest from `upstream`."""
+
+    def __init__(self, archive, upstream, cache=None):
+        super().__init__(cache)
+        self.archive = archive
+        self.upstream = upstream
+        self._synced = {}
+        self._sync_lock = threading.Lock()
+
+    def sync(self, name):
+        # Each time upstream changes, append its rows newer than the archive
+        fingerprint = self.upstream.fingerprint(name)
+        if self._synced.get(name) == fingerprint:
+            return 0
+        with self._sync_lock:
+            if self._synced.get(name) == fingerprint:
+                return 0
+            latest = self.archive.max_date(name)
+            fresh = self.upstream.load(name, date_range=(None if latest is None else latest.date(), None))
+            if latest is not None:
+                fresh = fresh[fresh['Date'] > latest]
+            added = self.archive.append(name, fresh)
+            self._synced[name] = fingerprint
+        return added
+
+    def fingerprint(self, name):
+        if name not in ARCHIVED_FRAMES:
+            return self.upstream.fingerprint(name)
+        self.sync(name)
+        return f"archive:{self.archive.manifest(name)['version']}"
+
+    def read_table(self, name):
+        if name not in ARCHIVED_FRAMES:
+            return self.upstream.read_table(name)
+        return self.archive.query(name)
+
+    def load(self, name, columns=None, date_range=None):
+        if name not in ARCHIVED_FRAMES:
+            return super().load(name, columns, date_range)
+        self.sync(name)
+        table = self.archive.query(name, columns, date_range)
+        if table is None:
+            # Nothing archived yet (upstream had no rows)
+            return self.upstream.load(name, columns, date_range)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas(split_blocks=True)
+
+    def date_bounds(self, name='water_security'):
+        if name not in ARCHIVED_FRAMES:
+            return super().date_bounds(name)
+        self.sync(name)
+        bounds = [part['stats']['Date'] for part in self.archive.manifest(name)['parts']]
+        if not bounds:
+            return self.upstream.date_bounds(name)
+        return pd.Timestamp(min(low for low, _ in bounds)), pd.Timestamp(max(high for _, high in bounds))
+
+    def warm(self, name):
+        if name in ARCHIVED_FRAMES:
+            self.sync(name)
+        else:
+            super().warm(name)
+
+    def invalidate(self):
+        super().invalidate()
+        self._synced = {}
+        self.upstream.invalidate()
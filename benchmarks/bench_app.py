@@ -0,0 +1,237 @@
+# Rerun latency benchmarks for app.py
+#
+# Each data size runs in a fresh subprocess (so imports and st.cache_resource
+# start cold) against a synthetic Parquet extract served via MANZI_DATA_DIR.
+# The app is driven headlessly with Streamlit's AppTest harness.
+#
+#   python benchmarks/bench_app.py                      # 1k, 10k, 100k rows
+#   python benchmarks/bench_app.py --sizes 1k,1M,10M --repeat 5
+#   python benchmarks/bench_app.py --update-baseline    # rewrite baseline.json
+#
+# Results are compared with benchmarks/baseline.json; any timing or peak
+# memory more than --tolerance above its baseline, and any baseline metric the
+# run no longer produces (a renamed widget, a removed tab), is reported and the
+# script exits non-zero. Regenerate the baseline when the app's surface changes.
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / 'app.py'
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+DEFAULT_SIZES = '1k,10k,100k'
+
+TABS = ["🏢 Executive Overview", "⚙️ Operations", "💰 Financial", "🔮 2030 Vision"]
+
+# (tab, widget label, values cycled through on each timed rerun)
+INTERACTIONS = [
+    ("🏢 Executive Overview", "Number of key leaks to fix", [5, 15]),
+    ("🏢 Executive Overview", "Cost per Ml (R)", [12000, 22000]),
+    ("🔮 2030 Vision", "Climate Change Severity (1-10)", [3, 9]),
+]
+DATE_RANGES = [(date(2022, 3, 1), date(2024, 8, 31)), (date(2024, 1, 1), date(2024, 12, 31))]
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def write_dataset(rows, directory, seed=42):
+    # Stretch the sample frames to `rows` rows over the same 2022-2024 window:
+    # time-series frames get evenly spaced timestamps, iot_data grows to
+    # rows / 100 stations (capped at 10k)
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sys.path.insert(0, str(ROOT))
+    from data_sources import FRAME_NAMES, generate_sample_data
+
+    frames = dict(zip(FRAME_NAMES, generate_sample_data(seed)))
+    rng = np.random.default_rng(seed)
+    start, end = pd.Timestamp('2022-01-01'), pd.Timestamp('2024-12-31')
+
+    for name, frame in frames.items():
+        if name == 'iot_data':
+            n_stations = int(min(max(rows // 100, len(frame)), 10_000))
+            frame = frame.iloc[rng.integers(0, len(frame), n_stations)].reset_index(drop=True)
+            frame['Station_ID'] = [f'MNZ{i:05d}' for i in range(1, n_stations + 1)]
+        elif 'Date' in frame.columns:
+            source_rows = np.linspace(0, len(frame) - 1, rows).round().astype(np.int64)
+            if name == 'zone_metrics':
+                # Keep every zone present at every timestamp
+                zones = frame['Zone'].unique()
+                per_zone = len(frame) // len(zones)
+                steps = np.linspace(0, per_zone - 1, -(-rows // len(zones))).round().astype(np.int64)
+                source_rows = (np.arange(len(zones))[:, None] * per_zone + steps).ravel()[:rows]
+            frame = frame.iloc[source_rows].reset_index(drop=True)
+            numeric = frame.select_dtypes('number').columns
+            frame[numeric] = frame[numeric] * rng.uniform(0.97, 1.03, (len(frame), len(numeric)))
+            if name == 'zone_metrics':
+                stamps = np.linspace(start.value, end.value, len(steps)).astype('datetime64[ns]')
+                frame['Date'] = np.tile(stamps, len(zones))[:rows]
+            else:
+                frame['Date'] = np.linspace(start.value, end.value, rows).astype('datetime64[ns]')
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), Path(directory) / f'{name}.parquet')
+
+
+def timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"app raised: {[e.value for e in at.exception]}")
+    return elapsed
+
+
+def find_widget(at, kind, label):
+    for widget in at.get(kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No {kind} labelled '{label}'")
+
+
+def measure(repeat):
+    # Runs inside the worker subprocess; MANZI_DATA_DIR is already set
+    from streamlit.testing.v1 import AppTest
+
+    result = {}
+    at = AppTest.from_file(str(APP), default_timeout=600)
+    result['cold_start_s'] = timed_run(at)
+
+    # First visit builds the tab's figures; later reruns hit the figure cache
+    first_visit, reruns = {}, {}
+    for tab in TABS:
+        at.radio(key='active_tab').set_value(tab)
+        first_visit[tab] = timed_run(at)
+        reruns[tab] = statistics.median(timed_run(at) for _ in range(repeat))
+    result['tab_first_visit_s'] = first_visit
+    result['tab_rerun_s'] = reruns
+
+    widgets = {}
+    for tab, label, values in INTERACTIONS:
+        at.radio(key='active_tab').set_value(tab)
+        timed_run(at)
+        samples = []
+        for i in range(repeat):
+            find_widget(at, 'slider', label).set_value(values[i % len(values)])
+            samples.append(timed_run(at))
+        widgets[label] = statistics.median(samples)
+
+    at.radio(key='active_tab').set_value(TABS[0])
+    timed_run(at)
+    samples = []
+    for i in range(repeat):
+        at.sidebar.date_input[0].set_value(DATE_RANGES[i % len(DATE_RANGES)])
+        samples.append(timed_run(at))
+    widgets['Select Date Range'] = statistics.median(samples)
+    result['interaction_s'] = widgets
+
+    from data_sources import generate_sample_data
+    started = time.perf_counter()
+    generate_sample_data()
+    result['generate_sample_data_s'] = time.perf_counter() - started
+
+    # ru_maxrss is in KiB on Linux; covers Arrow buffers that tracemalloc misses
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def run_size(rows, repeat):
+    with tempfile.TemporaryDirectory(prefix='manzi-bench-') as workdir:
+        data_dir = Path(workdir) / 'data'
+        data_dir.mkdir()
+        write_dataset(rows, data_dir)
+        env = dict(os.environ, MANZI_DATA_DIR=str(data_dir), MANZI_CACHE_DIR=str(Path(workdir) / 'cache'))
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', '--repeat', str(repeat)],
+            env=env, cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def flatten(result, prefix=''):
+    for key, value in result.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f'{prefix}{key}.')
+        else:
+            yield f'{prefix}{key}', value
+
+
+def compare(results, baseline, tolerance):
+    # -> (regressions, baseline metrics missing from results)
+    regressions, missing = [], []
+    for size, result in results.items():
+        previous = dict(flatten(baseline.get('results', {}).get(size, {})))
+        current = dict(flatten(result))
+        for metric, value in current.items():
+            if metric not in previous:
+                print(f'  {size:>8} {metric:<55} {value:10.3f}  (new, no baseline)')
+                continue
+            ratio = value / previous[metric] if previous[metric] else float('inf')
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  <-- REGRESSION'
+                regressions.append((size, metric, ratio))
+            print(f'  {size:>8} {metric:<55} {value:10.3f}  x{ratio:5.2f}{flag}')
+        for metric in previous.keys() - current.keys():
+            print(f'  {size:>8} {metric:<55} {"-":>10}  <-- MISSING')
+            missing.append((size, metric))
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark app.py rerun latency and peak memory')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma-separated row counts, e.g. 1k,100k,10M')
+    parser.add_argument('--repeat', type=int, default=3, help='timed reruns per tab / widget (median reported)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before flagging, 0.25 = 25%%')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(measure(args.repeat)))
+        return 0
+
+    results = {}
+    for size in args.sizes.split(','):
+        print(f'Benchmarking {size} rows ...', flush=True)
+        results[size] = run_size(parse_size(size), args.repeat)
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {'results': {}}
+        baseline['machine'] = f'{platform.machine()} / {platform.python_version()} / {os.cpu_count()} CPUs'
+        baseline['results'].update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + '\n')
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if not args.baseline.exists():
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    print(f"Compared with baseline recorded on {baseline.get('machine', 'unknown machine')}:")
+    regressions, missing = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f'{len(regressions)} regression(s) beyond {args.tolerance:.0%}')
+    if missing:
+        print(f'{len(missing)} baseline metric(s) not measured any more; rerun with --update-baseline')
+    return 1 if regressions or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
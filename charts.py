@@ -0,0 +1,172 @@
+# Plotly figure builders for the Manzi Water dashboard
+#
+# Builders are pure functions of their input frames and parameters so the
+# figure cache can memoize them and headless jobs can reuse them.
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+def leakage_map(zone_leakage):
+    # Create bubble map
+    fig = px.scatter_mapbox(
+        zone_leakage,
+        lat="Lat",
+        lon="Lon",
+        size="Leakage_Ml",
+        color="Monthly_Loss_R",
+        hover_name="Zone",
+        hover_data={"Leakage_Ml": ":.1f", "Monthly_Loss_R": ":,.0f", "NRW_%": ":.1f"},
+        color_continuous_scale="Reds",
+        size_max=50,
+        zoom=10
+    )
+
+    fig.update_layout(
+        mapbox_style="open-street-map",
+        mapbox=dict(center=dict(lat=-26.0, lon=28.0)),
+        height=400,
+        margin={"r":0,"t":0,"l":0,"b":0}
+    )
+    return fig
+
+
+def water_loss_vs_capex(trend_data):
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    fig.add_trace(
+        go.Scatter(
+            x=trend_data['Date'],
+            y=trend_data['Water_Loss_Ml_Monthly'],
+            name="Water Loss (Ml/month)",
+            line=dict(color='#E53935', width=3)
+        ),
+        secondary_y=False,
+    )
+
+    fig.add_trace(
+        go.Bar(
+            x=trend_data['Date'],
+            y=trend_data['CapEx_R']/1000000,
+            name="CapEx Investment (R M)",
+            opacity=0.6,
+            marker_color='#1E88E5'
+        ),
+        secondary_y=True,
+    )
+
+    fig.update_xaxes(title_text="Date")
+    fig.update_yaxes(title_text="Water Loss (Ml/month)", secondary_y=False)
+    fig.update_yaxes(title_text="Investment (R Millions)", secondary_y=True)
+
+    fig.update_layout(
+        title="Investment vs Water Loss Correlation",
+        height=400,
+        hovermode='x unified'
+    )
+    return fig
+
+
+def station_status_pie(status_counts):
+    fig = px.pie(
+        values=status_counts.values,
+        names=status_counts.index,
+        color_discrete_map={
+            'ONLINE': '#4CAF50',
+            'MAINTENANCE': '#FB8C00',
+            'CRITICAL': '#E53935'
+        }
+    )
+    fig.update_layout(height=300)
+    return fig
+
+
+def interruptions_by_zone(interruption_data):
+    fig = px.bar(
+        interruption_data,
+        x='Zone_Most_Affected',
+        y='Service_Interruptions_Count',
+        color='Avg_Downtime_Hours',
+        title='Service Interruptions by Zone',
+        color_continuous_scale='Reds'
+    )
+
+    fig.update_layout(height=400)
+    return fig
+
+
+def collection_rate_trend(financial_data):
+    fig = px.line(
+        financial_data,
+        x='Date',
+        y='Collection_Rate_%',
+        title='Revenue Collection Rate Over Time',
+        color_discrete_sequence=['#1E88E5']
+    )
+
+    fig.add_hline(y=85, line_dash="dash", line_color="red", annotation_text="Target: 85%")
+    fig.update_layout(height=300)
+    return fig
+
+
+def energy_vs_load_shedding(financial_data):
+    fig = px.scatter(
+        financial_data,
+        x='Load_Shedding_Hours',
+        y='Energy_Costs_R',
+        size='Energy_Costs_R',
+        color='Date',
+        title='Energy Costs vs Load Shedding Impact'
+    )
+
+    fig.update_layout(height=300)
+    return fig
+
+
+def project_pipeline(project_data):
+    # Stacked bar chart for project progress
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(name='Completed', x=project_data['Project_Type'], y=project_data['Completed'], marker_color='#4CAF50'))
+    fig.add_trace(go.Bar(name='In Progress', x=project_data['Project_Type'], y=project_data['In_Progress'], marker_color='#FB8C00'))
+    fig.add_trace(go.Bar(name='Planned', x=project_data['Project_Type'], y=project_data['Planned'], marker_color='#E53935'))
+
+    fig.update_layout(barmode='stack', height=400, title='Project Pipeline Status')
+    return fig
+
+
+def demand_projection_bands(demand_bands, forecasting_data):
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(x=demand_bands['Year'], y=demand_bands['P95'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(
+        x=demand_bands['Year'], y=demand_bands['P5'], fill='tonexty', fillcolor='rgba(30,136,229,0.15)',
+        line=dict(width=0), name='P5–P95'
+    ))
+    fig.add_trace(go.Scatter(x=demand_bands['Year'], y=demand_bands['P75'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(
+        x=demand_bands['Year'], y=demand_bands['P25'], fill='tonexty', fillcolor='rgba(30,136,229,0.3)',
+        line=dict(width=0), name='P25–P75'
+    ))
+    fig.add_trace(go.Scatter(x=demand_bands['Year'], y=demand_bands['P50'], name='Median', line=dict(color='#1E88E5', width=3)))
+    fig.add_trace(go.Scatter(
+        x=forecasting_data['Year'], y=forecasting_data['Demand_Projection_Ml'],
+        name='Base projection', line=dict(color='#43A047', dash='dash')
+    ))
+
+    fig.update_layout(height=350, yaxis_title='Demand (Ml)', hovermode='x unified')
+    return fig
+
+
+def failure_risk_curve(risk_curve, climate_severity):
+    fig = px.line(
+        risk_curve,
+        x='Climate_Severity',
+        y='Failure_Probability_%',
+        color='Investment_Level',
+        markers=True
+    )
+
+    fig.add_vline(x=climate_severity, line_dash="dash", line_color="gray")
+    fig.update_layout(height=350)
+    return fig
@@ -0,0 +1,425 @@
+# Data-source layer for the Manzi Water dashboard
+#
+# Every frame is served from a versioned Arrow (Feather v2) cache on local disk.
+# Cache files are uncompressed so they can be memory-mapped: reruns and new
+# sessions only touch the pages of the columns a tab actually plots.
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from leakage import DEFAULT_COST_PER_ML, flow_grid, l_min_to_ml_month
+from schema import conform_table
+
+FRAME_NAMES = ('water_security', 'financial_data', 'customer_impact', 'iot_data', 'zone_metrics')
+
+# Columns the dashboard tabs read from each frame (None = every column)
+FRAME_COLUMNS = {
+    'water_security': ['Date', 'Water_Loss_Ml_Monthly', 'Pipe_Leakage_Rate_%'],
+    'financial_data': ['Date', 'Billing_Amount_R', 'Revenue_Collected_R', 'Collection_Rate_%',
+                       'Energy_Costs_R', 'Load_Shedding_Hours', 'Infrastructure_ROI_%', 'CapEx_R'],
+    'customer_impact': ['Date', 'CSAT_Score', 'Zone_Most_Affected', 'Service_Interruptions_Count',
+                        'Avg_Downtime_Hours'],
+    'iot_data': ['Station_ID', 'Location', 'Status', 'Flow_Rate_L_min', 'Pressure_kPa', 'pH_Level',
+                 'Chlorine_mg_L', 'Temperature_C'],
+    'zone_metrics': ['Date', 'Zone', 'Demand_Ml', 'Leakage_Ml', 'Monthly_Loss_R'],
+}
+
+# Frames carrying a zone dimension, and the column that holds it.
+# customer_impact's Zone_Most_Affected describes a city-wide month, so that
+# frame is not split by zone
+ZONE_COLUMNS = {
+    'iot_data': 'Location',
+    'zone_metrics': 'Zone',
+}
+
+# Map positions for the leakage hotspot map
+ZONE_COORDINATES = pd.DataFrame({
+    'Zone': ['Alexandra_Central', 'Soweto_North', 'Tembisa_East', 'Diepsloot', 'Midrand', 'Sandton'],
+    'Lat': [-26.1, -26.2, -25.9, -25.9, -25.9, -26.1],
+    'Lon': [28.1, 27.9, 28.2, 28.0, 28.1, 28.0]
+})
+
+# Bump when the cache layout or the synthetic generator changes
+CACHE_VERSION = 5
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'manzi')
+
+
+# Generate comprehensive sample data
+def generate_sample_data(seed=42):
+    # Date range
+    dates = pd.date_range(start='2022-01-01', end='2024-12-31', freq='ME')
+    
+    # Water Security Data
+    np.random.seed(seed)  # For reproducible results
+    water_security = pd.DataFrame({
+        'Date': dates,
+        'Reservoir_Capacity_%': np.random.uniform(55, 80, len(dates)) * (1 - np.linspace(0, 0.2, len(dates))),
+        'Drought_Status': np.random.choice(['GREEN', 'YELLOW', 'RED'], len(dates), p=[0.3, 0.4, 0.3]),
+        'Pump_Downtime_Hours': np.random.uniform(8, 60, len(dates)) * (1 + np.linspace(0, 0.5, len(dates))),
+        'Pipe_Leakage_Rate_%': np.random.uniform(14, 24, len(dates)) * (1 + np.linspace(0, 0.3, len(dates))),
+        'Water_Loss_Ml_Monthly': np.random.uniform(110, 170, len(dates)) * (1 + np.linspace(0, 0.4, len(dates))),
+        'Borehole_Active_Count': np.random.uniform(20, 45, len(dates)),
+        'Quality_Tests_Passed_%': np.random.uniform(88, 99, len(dates))
+    })
+    
+    # Financial Performance Data
+    financial_data = pd.DataFrame({
+        'Date': dates,
+        'Billing_Amount_R': np.random.uniform(8000000, 13000000, len(dates)) * (1 + np.linspace(0, 0.5, len(dates))),
+        'Revenue_Collected_R': lambda x: x * np.random.uniform(0.75, 0.92, len(dates)),
+        'Energy_Costs_R': np.random.uniform(1100000, 2700000, len(dates)) * (1 + np.linspace(0, 1.2, len(dates))),
+        'Load_Shedding_Hours': np.random.uniform(10, 160, len(dates)) * (1 + np.linspace(0, 2, len(dates))),
+        'Infrastructure_ROI_%': np.random.uniform(7, 14, len(dates)) * (1 - np.linspace(0, 0.4, len(dates))),
+        'OpEx_R': np.random.uniform(4000000, 6700000, len(dates)) * (1 + np.linspace(0, 0.6, len(dates))),
+        'CapEx_R': np.random.uniform(1800000, 3500000, len(dates))
+    })
+    
+    # Fix Revenue_Collected_R calculation
+    financial_data['Revenue_Collected_R'] = financial_data['Billing_Amount_R'] * np.random.uniform(0.75, 0.92, len(dates))
+    financial_data['Collection_Rate_%'] = (financial_data['Revenue_Collected_R'] / financial_data['Billing_Amount_R']) * 100
+    
+    # Customer Impact Data
+    customer_impact = pd.DataFrame({
+        'Date': dates,
+        'Service_Interruptions_Count': np.random.uniform(15, 80, len(dates)) * (1 + np.linspace(0, 1.5, len(dates))),
+        'Avg_Downtime_Hours': np.random.uniform(3, 11, len(dates)) * (1 + np.linspace(0, 1.2, len(dates))),
+        'SANS241_Compliance_%': np.random.uniform(88, 99, len(dates)) * (1 - np.linspace(0, 0.08, len(dates))),
+        'CSAT_Score': np.random.uniform(5.5, 8.5, len(dates)) * (1 - np.linspace(0, 0.25, len(dates))),
+        'Complaints_Count': np.random.uniform(35, 130, len(dates)) * (1 + np.linspace(0, 1.8, len(dates))),
+        'Zone_Most_Affected': np.random.choice(['Soweto_North', 'Alexandra_Central', 'Tembisa_East', 'Diepsloot'], len(dates)),
+        'Population_Served': np.random.uniform(2400000, 2650000, len(dates))
+    })
+    
+    # IoT Telemetry Data
+    iot_data = pd.DataFrame({
+        'Station_ID': [f'MNZ{i:03d}' for i in range(1, 101)],
+        'Location': np.random.choice(['Soweto_North', 'Alexandra_Central', 'Tembisa_East', 'Diepsloot', 'Midrand', 'Sandton'], 100),
+        'Status': np.random.choice(['ONLINE', 'MAINTENANCE', 'CRITICAL'], 100, p=[0.75, 0.15, 0.10]),
+        'Flow_Rate_L_min': np.random.uniform(0, 550, 100),
+        'Pressure_kPa': np.random.uniform(0, 280, 100),
+        'Temperature_C': np.random.uniform(15, 25, 100),
+        'pH_Level': np.random.uniform(6.5, 8.0, 100),
+        'Chlorine_mg_L': np.random.uniform(0.2, 1.2, 100)
+    })
+    
+    # Zone-level monthly metrics
+    zone_baseline = pd.DataFrame({
+        'Zone': ['Alexandra_Central', 'Soweto_North', 'Tembisa_East', 'Diepsloot', 'Midrand', 'Sandton'],
+        'Leakage_Ml': [23, 18, 12, 15, 8, 5],
+        'Demand_Ml': [52, 78, 46, 38, 31, 42]
+    })
+    zone_metrics = zone_baseline.merge(pd.DataFrame({'Date': dates}), how='cross')
+    trend = np.tile(np.linspace(0.7, 1.0, len(dates)), len(zone_baseline))
+    zone_metrics['Leakage_Ml'] = zone_metrics['Leakage_Ml'] * trend * np.random.uniform(0.85, 1.15, len(zone_metrics))
+    zone_metrics['Demand_Ml'] = zone_metrics['Demand_Ml'] * (0.9 + 0.1 * trend) * np.random.uniform(0.95, 1.05, len(zone_metrics))
+    zone_metrics['Monthly_Loss_R'] = zone_metrics['Leakage_Ml'] * np.random.uniform(16000, 19000, len(zone_metrics))
+    zone_metrics = zone_metrics[['Date', 'Zone', 'Demand_Ml', 'Leakage_Ml', 'Monthly_Loss_R']]
+    
+    return water_security, financial_data, customer_impact, iot_data, zone_metrics
+
+
+# zone_metrics for extracts that predate it: the city's monthly water loss is
+# split across zones by their share of station flow, and each zone's summed
+# station flow stands in for its demand
+def derive_zone_metrics(water_security, iot_data):
+    flow = iot_data.groupby(iot_data['Location'].astype(str))['Flow_Rate_L_min'].sum()
+    zones = pd.DataFrame({
+        'Zone': flow.index,
+        'Demand_Ml': l_min_to_ml_month(flow.to_numpy(dtype=np.float64)),
+        'Share': (flow / flow.sum()).to_numpy(),
+    })
+    zone_metrics = water_security[['Date', 'Water_Loss_Ml_Monthly']].merge(zones, how='cross')
+    zone_metrics['Leakage_Ml'] = zone_metrics['Water_Loss_Ml_Monthly'] * zone_metrics['Share']
+    zone_metrics['Monthly_Loss_R'] = zone_metrics['Leakage_Ml'] * DEFAULT_COST_PER_ML
+    return zone_metrics[['Date', 'Zone', 'Demand_Ml', 'Leakage_Ml', 'Monthly_Loss_R']]
+
+
+# 15-minute station flow history for the water balance: each station carries
+# its share of the zone's metered demand on a diurnal profile, and leaking
+# stations add a constant flow that shows up in the minimum night flow
+def generate_flow_history(stations, zone_volumes, days=28, interval_minutes=15, end=None, seed=42):
+    # zone_volumes: Zone, Demand_Ml, Leakage_Ml per month -> (slot timestamps, stations x slots L/min)
+    rng = np.random.default_rng(seed)
+    minutes_per_month = 30.4 * 24 * 60
+    volumes = zone_volumes.set_index('Zone')
+    zones = stations['Location'].astype(str).to_numpy()
+    n_stations = len(zones)
+
+    demand = np.zeros(n_stations)
+    leak = np.zeros(n_stations)
+    for zone, members in pd.Series(np.arange(n_stations)).groupby(zones):
+        if zone not in volumes.index:
+            continue
+        members = members.to_numpy()
+        demand[members] = volumes.at[zone, 'Demand_Ml'] * 1e6 / minutes_per_month * rng.dirichlet(np.ones(len(members)))
+        # Roughly a third of the stations carry the zone's leakage
+        leaking = members[rng.random(len(members)) < 0.35]
+        if not len(leaking):
+            leaking = members[:1]
+        leak[leaking] = volumes.at[zone, 'Leakage_Ml'] * 1e6 / minutes_per_month * rng.dirichlet(np.full(len(leaking), 0.7))
+
+    steps_per_day = 24 * 60 // interval_minutes
+    end = pd.Timestamp(end if end is not None else pd.Timestamp.now(tz='UTC').floor('D')).timestamp()
+    timestamps = end - (days * steps_per_day - np.arange(days * steps_per_day)) * interval_minutes * 60
+
+    # Morning and evening peaks, low night use, mean 1 over the day
+    hour = ((timestamps[:steps_per_day] + 2 * 3600) % 86400) / 3600
+    peaks = 1.6 * np.exp(-((hour - 7) / 2) ** 2) + 1.2 * np.exp(-((hour - 19) / 2.5) ** 2) + 0.4 * ((hour >= 6) & (hour < 22))
+    profile = np.tile(0.15 + 0.85 * peaks / peaks.mean(), days).astype(np.float32)
+
+    flow = np.empty((n_stations, len(timestamps)), dtype=np.float32)
+    for begin in range(0, n_stations, 256):
+        rows = slice(begin, begin + 256)
+        noise = rng.lognormal(0, 0.1, (len(demand[rows]), len(timestamps))).astype(np.float32)
+        flow[rows] = demand[rows, None].astype(np.float32) * profile * noise + leak[rows, None].astype(np.float32)
+    return timestamps, flow
+
+
+def load_flow_history(path, station_ids, interval_minutes=15):
+    # Parquet export of station readings (Timestamp, Station_ID, Flow_Rate_L_min) -> grid
+    table = pq.read_table(path, columns=['Timestamp', 'Station_ID', 'Flow_Rate_L_min']).to_pandas()
+    timestamps = table['Timestamp']
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = (pd.to_datetime(timestamps, utc=True) - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(seconds=1)
+    index = pd.Index(station_ids).get_indexer(table['Station_ID'])
+    known = index >= 0
+    return flow_grid(
+        timestamps.to_numpy(dtype=np.float64)[known], index[known],
+        table['Flow_Rate_L_min'].to_numpy(dtype=np.float32)[known], len(station_ids), interval_minutes * 60.0,
+    )
+
+def prepare_table(name, table):
+    # Sort by Date and apply the compact schema (zones become dictionaries)
+    # once, when the cache is written
+    if 'Date' in table.column_names:
+        table = table.sort_by('Date')
+    return conform_table(name, table).combine_chunks()
+
+
+class FrameCache:
+    """Versioned on-disk Arrow cache keyed by source fingerprint."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name, fingerprint):
+        key = hashlib.sha1(f"{CACHE_VERSION}:{name}:{fingerprint}".encode()).hexdigest()[:16]
+        return self.cache_dir / f"{name}-{key}.arrow"
+
+    def get(self, name, fingerprint):
+        path = self.path(name, fingerprint)
+        if not path.exists():
+            return None
+        return feather.read_table(path, memory_map=True)
+
+    def put(self, name, fingerprint, table):
+        path = self.path(name, fingerprint)
+        # A temp file per writer: another thread or replica may be writing the same frame
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f'{name}-', suffix='.tmp', delete=False) as handle:
+            tmp = handle.name
+        try:
+            # Uncompressed so the file can be memory-mapped without decoding
+            feather.write_feather(table, tmp, compression='uncompressed')
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+        # Drop cache files for older versions of the same frame
+        for stale in self.cache_dir.glob(f"{name}-*.arrow"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+
+class DataSource:
+    """Base backend: subclasses provide fingerprint() and read_table()."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or FrameCache()
+        self._tables = {}
+        # One lock per frame: a single thread builds and maps each table
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def fingerprint(self, name):
+        raise NotImplementedError
+
+    def read_table(self, name):
+        raise NotImplementedError
+
+    def fingerprints(self):
+        return tuple(self.fingerprint(name) for name in FRAME_NAMES)
+
+    def _lock(self, name):
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _entry(self, name):
+        # (table, sorted Date array or None) for the frame's current fingerprint
+        fingerprint = self.fingerprint(name)
+        entry = self._tables.get((name, fingerprint))
+        if entry is None:
+            with self._lock(name):
+                # Another thread may have mapped it while this one waited
+                entry = self._tables.get((name, fingerprint))
+                if entry is None:
+                    entry = self._map(name, fingerprint)
+        return entry
+
+    def table(self, name, columns=None):
+        table, _ = self._entry(name)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table
+
+    def _map(self, name, fingerprint):
+        table = self.cache.get(name, fingerprint)
+        if table is None:
+            self.cache.put(name, fingerprint, prepare_table(name, self.read_table(name)))
+            table = self.cache.get(name, fingerprint)
+        # Cached tables are Date-sorted, so this is the binary-search index;
+        # it is stored with the table it indexes, under the same key
+        dates = table.column('Date').to_numpy() if 'Date' in table.column_names else None
+        # Published last, and as a new dict, so lock-free readers never see a half-built entry
+        with self._locks_guard:
+            tables = {key: entry for key, entry in self._tables.items() if key[0] != name}
+            tables[(name, fingerprint)] = (table, dates)
+            self._tables = tables
+        return table, dates
+
+    def load(self, name, columns=None, date_range=None):
+        table, dates = self._entry(name)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+
+        # Date window: two binary searches and a zero-copy slice of the mmap
+        if date_range is not None and dates is not None:
+            start, end = date_range
+            lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left')
+            hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1)), side='left')
+            table = table.slice(lo, hi - lo)
+
+        # split_blocks keeps numeric columns as read-only views onto the mapped Arrow buffers
+        return table.to_pandas(split_blocks=True)
+
+    def date_bounds(self, name='water_security'):
+        # First and last Date of a frame, from its sorted date index
+        _, dates = self._entry(name)
+        return pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+
+    def warm(self, name):
+        # Map `name` ahead of the first session that needs it
+        self.table(name, FRAME_COLUMNS[name])
+
+    def invalidate(self):
+        # Drop the mapped tables so the next load re-checks fingerprints and re-maps
+        self._tables = {}
+
+
+class SyntheticSource(DataSource):
+    """Backend that serves generate_sample_data() through the cache."""
+
+    def __init__(self, seed=42, cache=None):
+        super().__init__(cache)
+        self.seed = seed
+        self._frames = None
+
+    def fingerprint(self, name):
+        return f"synthetic:{self.seed}"
+
+    def read_table(self, name):
+        if self._frames is None:
+            self._frames = dict(zip(FRAME_NAMES, generate_sample_data(self.seed)))
+        return pa.Table.from_pandas(self._frames[name], preserve_index=False)
+
+
+# Frames a ParquetSource can derive from others when their file is missing
+DERIVED_FRAMES = {
+    'zone_metrics': (('water_security', 'iot_data'), derive_zone_metrics),
+}
+
+
+class ParquetSource(DataSource):
+    """Backend reading one <frame>.parquet (or .arrow) file per frame from a directory."""
+
+    def __init__(self, data_dir, cache=None):
+        super().__init__(cache)
+        self.data_dir = Path(data_dir)
+
+    def find_path(self, name):
+        for suffix in ('.parquet', '.arrow', '.feather'):
+            path = self.data_dir / f"{name}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def source_path(self, name):
+        path = self.find_path(name)
+        if path is None:
+            raise FileNotFoundError(f"No data file for '{name}' in {self.data_dir}")
+        return path
+
+    def fingerprint(self, name):
+        if name in DERIVED_FRAMES and self.find_path(name) is None:
+            inputs, _ = DERIVED_FRAMES[name]
+            return 'derived:' + '|'.join(self.fingerprint(input_name) for input_name in inputs)
+        stat = self.source_path(name).stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def read_table(self, name):
+        if name in DERIVED_FRAMES and self.find_path(name) is None:
+            inputs, derive = DERIVED_FRAMES[name]
+            frame = derive(*(self.read_table(input_name).to_pandas() for input_name in inputs))
+            return pa.Table.from_pandas(frame, preserve_index=False)
+        path = self.source_path(name)
+        if path.suffix == '.parquet':
+            return pq.read_table(path, memory_map=True)
+        return feather.read_table(path, memory_map=True)
+
+
+def frame_memory(frame):
+    # (shared, private) bytes: read-only ndarray columns are views onto shared Arrow memory
+    shared = private = 0
+    for name in frame.columns:
+        values = frame[name].values
+        if isinstance(values, np.ndarray) and not values.flags.writeable:
+            shared += values.nbytes
+        else:
+            private += frame[name].memory_usage(deep=True, index=False)
+    return shared, private
+
+
+def get_data_source():
+    # MANZI_DATA_DIR switches from synthetic data to real Parquet/Arrow extracts;
+    # MANZI_FEEDS layers live feeds from the upstream systems on top of either
+    cache_dir = os.environ.get('MANZI_CACHE_DIR', DEFAULT_CACHE_DIR)
+    cache = FrameCache(cache_dir)
+    data_dir = os.environ.get('MANZI_DATA_DIR')
+    source = ParquetSource(data_dir, cache=cache) if data_dir else SyntheticSource(cache=cache)
+
+    feeds_config = os.environ.get('MANZI_FEEDS')
+    if feeds_config:
+        from feeds import FeedScheduler, FeedSource, load_feeds
+        scheduler = FeedScheduler(load_feeds(feeds_config), os.path.join(cache_dir, 'feeds'))
+        source = FeedSource(scheduler, fallback=source, cache=cache)
+        # The snapshot exporter only reads the snapshots the dashboard persists
+        if os.environ.get('MANZI_EXPORT_MODE') != '1':
+            # Persisted snapshots make this immediate after the first start
+            scheduler.start().wait_ready(float(os.environ.get('MANZI_FEEDS_STARTUP_S', 15)))
+
+    # MANZI_ARCHIVE_DIR keeps the full monthly history in a partitioned archive
+    archive_dir = os.environ.get('MANZI_ARCHIVE_DIR')
+    if archive_dir:
+        from archive import Archive, ArchiveSource
+        source = ArchiveSource(Archive(archive_dir), upstream=source, cache=cache)
+    return source
@@ -0,0 +1,78 @@
+# Server-side downsampling for time-series charts
+#
+# Long series are reduced to about one point per horizontal pixel before they
+# are sent to the browser; scatter charts are averaged into time buckets
+# instead. Windows that already fit the chart width (a narrow date_range) go
+# through at full resolution.
+import numpy as np
+import pandas as pd
+
+# Rendered width of the wide page layout
+PAGE_WIDTH_PX = 1400
+
+
+def chart_width(columns=1):
+    # Width of a chart placed in one of `columns` equal st.columns
+    return PAGE_WIDTH_PX // columns
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: first and last points are always kept
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Average of every bucket up front, in one pass
+    counts = np.diff(edges)
+    bucket_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    bucket_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    bucket_x = np.append(bucket_x, x[-1])
+    bucket_y = np.append(bucket_y, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Triangle area against the previous pick and the next bucket's average
+        area = np.abs(
+            (x[previous] - bucket_x[i + 1]) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (bucket_y[i + 1] - y[previous])
+        )
+        previous = lo + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample(frame, x, columns, width_px):
+    # Rows of `frame` to plot: the union of the points kept for each y column
+    if len(frame) <= width_px:
+        return frame
+    x_values = _as_float(frame[x].to_numpy())
+    keep = []
+    for column in columns:
+        keep.append(lttb_indices(x_values, _as_float(frame[column].to_numpy()), width_px))
+    return frame.iloc[np.unique(np.concatenate(keep))]
+
+
+def bucket_means(frame, x, columns, n_buckets):
+    # Consecutive rows of an x-sorted frame averaged into n_buckets points;
+    # for scatters, where dropping points would hide where the mass lies
+    if len(frame) <= n_buckets:
+        return frame
+    bucket = np.arange(len(frame)) * n_buckets // len(frame)
+    counts = np.bincount(bucket, minlength=n_buckets)
+    averaged = {x: _as_float(frame[x].to_numpy())}
+    averaged.update({column: _as_float(frame[column].to_numpy()) for column in columns})
+    averaged = {name: np.bincount(bucket, weights=values, minlength=n_buckets) / counts for name, values in averaged.items()}
+    if np.issubdtype(frame[x].dtype, np.datetime64):
+        averaged[x] = pd.to_datetime(averaged[x].astype(np.int64)).round('s')
+    return pd.DataFrame(averaged)
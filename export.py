@@ -0,0 +1,309 @@
+# Static snapshot export for wallboards and emailed reports
+#
+# Runs the dashboard headlessly (Streamlit's AppTest runner, default filters)
+# once per tab and writes what it rendered - KPI cards, metrics, tables and
+# Plotly figures - to a static HTML bundle, plus PNG/PDF copies of every
+# figure when kaleido is installed. Passive viewers load the bundle instead
+# of opening a Streamlit session.
+#
+# Exports run the app with MANZI_EXPORT_MODE=1: no telemetry listener (so no
+# clash over MANZI_TELEMETRY_UDP), no simulator and no feed refresh loop of
+# its own. Frames come from the same data directory, archive and persisted
+# feed snapshots as the live dashboard, and station telemetry is the latest
+# SCADA export, so point MANZI_CACHE_DIR and friends at the same places.
+#
+# The exporter is a long-lived sidecar process, so the dashboard's shared
+# caches (mapped frames, rollups, FigureCache specs) stay warm between
+# exports: an export with unchanged data rebuilds nothing. Figure images are
+# named by a hash of their spec and only rendered once; pages are rewritten
+# only when their content changes, keeping Last-Modified stable for caches.
+#
+#   python export.py --interval 300 --out static/snapshot --serve 8502
+#
+# --serve binds to 127.0.0.1 unless --host (or MANZI_EXPORT_HOST) says
+# otherwise, e.g. --host 0.0.0.0 behind a wallboard network's firewall.
+#
+# With server.enableStaticServing the default --out is also reachable under
+# /app/static/snapshot/ of the dashboard itself.
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+APP_PATH = Path(__file__).with_name('app.py')
+DEFAULT_EXPORT_DIR = os.path.join('static', 'snapshot')
+TAB_KEY = 'active_tab'
+MAX_TABLE_ROWS = 50
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed files never change; pages are revalidated each interval
+IMMUTABLE = re.compile(r'^/(fig-[0-9a-f]+\.(png|pdf)|plotly-[\w.]+\.min\.js)$')
+
+PAGE_CSS = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 24px auto; max-width: 1400px; color: #262730; }
+nav a { margin-right: 16px; }
+.row { display: flex; gap: 16px; align-items: flex-start; }
+.row > div { min-width: 0; }
+.metric { padding: 8px 0; }
+.metric .label { font-size: 0.9em; color: #555; }
+.metric .value { font-size: 2em; }
+.metric .delta { font-size: 0.9em; }
+.delta-green { color: #09AB3B; } .delta-red { color: #FF2B2B; } .delta-gray { color: #808495; }
+.caption { font-size: 0.85em; color: #808495; }
+table { border-collapse: collapse; font-size: 0.85em; }
+td, th { border: 1px solid #e6e9ef; padding: 4px 8px; text-align: right; }
+.stamp { color: #808495; font-size: 0.85em; }
+.error-box, .warning-box, .info-box, .success-box { padding: 12px 16px; border-radius: 5px; margin: 10px 0; }
+.error-box { background: #FFE5E5; } .warning-box { background: #FFF3CD; }
+.info-box { background: #E3F2FD; } .success-box { background: #E8F5E8; }
+"""
+
+DELTA_COLORS = {0: 'red', 1: 'green'}
+DELTA_ARROWS = {0: '↓ ', 1: '↑ '}
+
+
+def has_kaleido():
+    return importlib.util.find_spec('kaleido') is not None
+
+
+def slugify(label):
+    slug = re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-')
+    return slug or 'tab'
+
+
+def write_if_changed(path, data):
+    # Atomic write; returns False (and leaves the file alone) if nothing changed
+    data = data.encode() if isinstance(data, str) else data
+    if path.exists() and path.read_bytes() == data:
+        return False
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _children(node):
+    children = getattr(node, 'children', None)
+    return children.values() if isinstance(children, dict) else ()
+
+
+class SnapshotExporter:
+    """Renders every dashboard tab headlessly into a static HTML bundle."""
+
+    def __init__(self, out_dir=DEFAULT_EXPORT_DIR, app_path=APP_PATH, images=None, timeout=300, refresh_s=None):
+        self.out_dir = Path(out_dir)
+        self.app_path = str(app_path)
+        self.images = has_kaleido() if images is None else images
+        self.timeout = timeout
+        self.refresh_s = refresh_s
+        self.exports = 0
+        self.images_rendered = 0
+        self.last_export = None
+        self.last_duration_s = None
+        self._bodies = {}
+
+    # Element tree -> HTML
+    def render_node(self, node, figures):
+        kind = getattr(node, 'type', '')
+        if kind == 'markdown':
+            if node.proto.allow_html:
+                return node.value
+            text = html.escape(node.value)
+            text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+            return f'<p>{text}</p>'.replace('\n', '<br>')
+        if kind in ('title', 'header', 'subheader'):
+            level = {'title': 1, 'header': 2, 'subheader': 3}[kind]
+            return f'<h{level}>{html.escape(node.value)}</h{level}>'
+        if kind == 'caption':
+            return f'<p class="caption">{html.escape(node.value)}</p>'
+        if kind in ('error', 'warning', 'info', 'success'):
+            return f'<div class="{kind}-box"><p>{html.escape(node.value)}</p></div>'
+        if kind == 'metric':
+            delta = ''
+            if node.delta:
+                color = DELTA_COLORS.get(node.proto.color, 'gray')
+                arrow = DELTA_ARROWS.get(node.proto.direction, '')
+                delta = f'<div class="delta delta-{color}">{arrow}{html.escape(node.delta)}</div>'
+            return (f'<div class="metric"><div class="label">{html.escape(node.label)}</div>'
+                    f'<div class="value">{html.escape(node.value)}</div>{delta}</div>')
+        if kind == 'dataframe':
+            frame = node.value
+            return frame.head(MAX_TABLE_ROWS).to_html(index=False, border=0, float_format=lambda x: f'{x:,.2f}')
+        if kind == 'plotly_chart':
+            return self.render_figure(node.proto.spec, figures)
+        if kind == 'expander':
+            inner = ''.join(self.render_node(child, figures) for child in _children(node))
+            return f'<details open><summary>{html.escape(node.label)}</summary>{inner}</details>'
+        if kind == 'column':
+            inner = ''.join(self.render_node(child, figures) for child in _children(node))
+            return f'<div style="flex: {node.proto.weight or 1}">{inner}</div>'
+        if kind in ('main', 'flex_container', 'vertical', 'horizontal', ''):
+            inner = ''.join(self.render_node(child, figures) for child in _children(node))
+            if any(getattr(child, 'type', '') == 'column' for child in _children(node)):
+                return f'<div class="row">{inner}</div>'
+            return inner
+        # Widgets (radio, sliders, pickers, buttons) have no static equivalent
+        return ''
+
+    def render_figure(self, spec, figures):
+        digest = hashlib.sha1(spec.encode()).hexdigest()[:16]
+        element_id = f'fig-{len(figures)}'
+        figures.append((digest, spec))
+        links = ''
+        if self.images:
+            links = (f'<p class="caption"><a href="fig-{digest}.png">PNG</a> · '
+                     f'<a href="fig-{digest}.pdf">PDF</a></p>')
+        # "</" would end the inline script early
+        spec = spec.replace('</', '<\\/')
+        return (f'<div id="{element_id}"></div>'
+                f'<script>(function () {{ var fig = {spec}; '
+                f'Plotly.newPlot("{element_id}", fig.data, fig.layout, {{responsive: true, displaylogo: false}}); }})();</script>'
+                f'{links}')
+
+    def write_images(self, figures):
+        # Each distinct spec is rasterized once; kaleido is slow, specs rarely change
+        import plotly.io as pio
+        for digest, spec in figures:
+            for fmt in ('png', 'pdf'):
+                path = self.out_dir / f'fig-{digest}.{fmt}'
+                if not path.exists():
+                    write_if_changed(path, pio.to_image(pio.from_json(spec), format=fmt, width=1200, height=600))
+                    self.images_rendered += 1
+
+    def prune_images(self, current, keep_s=86400):
+        # Images no page has referenced for a day (cached pages may still link newer ones)
+        now = time.time()
+        for path in self.out_dir.glob('fig-*.*'):
+            if path.stem[4:] not in current and now - path.stat().st_mtime > keep_s:
+                path.unlink(missing_ok=True)
+
+    def plotly_js(self):
+        import plotly
+        from plotly.offline import get_plotlyjs
+        name = f'plotly-{plotly.__version__}.min.js'
+        path = self.out_dir / name
+        if not path.exists():
+            write_if_changed(path, get_plotlyjs())
+        return name
+
+    def page(self, title, body, tabs, stamp, script):
+        nav = ''.join(f'<a href="{slug}.html">{html.escape(label)}</a>' for label, slug in tabs)
+        refresh = f'<meta http-equiv="refresh" content="{int(self.refresh_s)}">' if self.refresh_s else ''
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8">{refresh}'
+                f'<title>{html.escape(title)} · Manzi Water</title><style>{PAGE_CSS}</style>'
+                f'<script src="{script}"></script></head><body>'
+                f'<nav>{nav}</nav><p class="stamp">Snapshot taken {stamp}</p>{body}</body></html>')
+
+    def export(self):
+        # One headless run per tab; returns {page file: whether it changed}
+        from streamlit.testing.v1 import AppTest
+
+        started = time.perf_counter()
+        os.environ['MANZI_EXPORT_MODE'] = '1'
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        script = self.plotly_js()
+        stamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+        at = AppTest.from_file(self.app_path, default_timeout=self.timeout).run()
+        labels = list(at.radio(key=TAB_KEY).options)
+        tabs = [(label, slugify(label)) for label in labels]
+
+        bodies = {}
+        figures = []
+        for label, slug in tabs:
+            if at.radio(key=TAB_KEY).value != label:
+                at.radio(key=TAB_KEY).set_value(label).run()
+            if at.exception:
+                raise RuntimeError(f'{label}: {at.exception[0].value}')
+            tab_figures = []
+            bodies[f'{slug}.html'] = (label, self.render_node(at.main, tab_figures))
+            figures.extend(tab_figures)
+        bodies['index.html'] = bodies[f'{tabs[0][1]}.html']
+
+        if self.images:
+            self.write_images(figures)
+        # A page only gets a new timestamp (and Last-Modified) when its content changed
+        changed = {}
+        for name, (label, body) in bodies.items():
+            changed[name] = self._bodies.get(name) != body or not (self.out_dir / name).exists()
+            if changed[name]:
+                write_if_changed(self.out_dir / name, self.page(label, body, tabs, stamp, script))
+                self._bodies[name] = body
+        self.prune_images({digest for digest, _ in figures})
+        write_if_changed(self.out_dir / 'manifest.json', json.dumps({
+            'tabs': [{'label': label, 'page': f'{slug}.html'} for label, slug in tabs],
+            'figures': sorted({digest for digest, _ in figures}),
+            'images': self.images,
+        }, indent=2))
+
+        self.exports += 1
+        self.last_export = time.time()
+        self.last_duration_s = time.perf_counter() - started
+        return changed
+
+    def run_forever(self, interval_s):
+        while True:
+            try:
+                changed = self.export()
+                logger.info('snapshot: %d of %d pages changed in %.1fs', sum(changed.values()), len(changed), self.last_duration_s)
+            except Exception:
+                # Keep serving the previous bundle; try again next interval
+                logger.exception('snapshot failed')
+            time.sleep(interval_s)
+
+
+def serve_bundle(directory, port, max_age_s=300, host='127.0.0.1'):
+    # Static file server with cache headers, so a CDN or browser cache absorbs the viewers
+    class BundleHandler(SimpleHTTPRequestHandler):
+        def end_headers(self):
+            if IMMUTABLE.match(self.path.split('?')[0]):
+                self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            else:
+                self.send_header('Cache-Control', f'public, max-age={max_age_s}')
+            super().end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), partial(BundleHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, name='manzi-snapshot', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the dashboard to a static HTML bundle")
+    parser.add_argument('--out', default=os.environ.get('MANZI_EXPORT_DIR', DEFAULT_EXPORT_DIR))
+    parser.add_argument('--interval', type=float, default=float(os.environ.get('MANZI_EXPORT_INTERVAL', 0)),
+                        help="seconds between exports; 0 exports once and exits")
+    parser.add_argument('--serve', type=int, default=None, help="serve the bundle on this port")
+    parser.add_argument('--host', default=os.environ.get('MANZI_EXPORT_HOST', '127.0.0.1'),
+                        help="address to serve on; 0.0.0.0 to reach it from other machines")
+    parser.add_argument('--no-images', action='store_true', help="skip PNG/PDF even if kaleido is installed")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    exporter = SnapshotExporter(args.out, images=False if args.no_images else None, refresh_s=args.interval or None)
+    if args.serve is not None:
+        serve_bundle(args.out, args.serve, max_age_s=int(args.interval) or 300, host=args.host)
+    if args.interval:
+        exporter.run_forever(args.interval)
+    else:
+        changed = exporter.export()
+        logger.info('snapshot: %d of %d pages changed in %.1fs', sum(changed.values()), len(changed), exporter.last_duration_s)
+        if args.serve is not None:
+            threading.Event().wait()
+
+
+if __name__ == '__main__':
+    main()
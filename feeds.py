@@ -0,0 +1,287 @@
+# Background refresh of the external data feeds
+#
+# Billing, SCADA, LIMS and CRM each publish one dataset over
+# HTTP. An asyncio scheduler on its own thread refreshes every due feed in
+# one concurrent batch over pooled keep-alive connections (an httpx
+# AsyncClient, so fetches never tie up worker threads), with a per-feed
+# TTL and conditional requests (ETag). Sessions only ever read the last good
+# snapshot: a failed, slow or malformed fetch leaves it in place (stale-while-
+# revalidate), and snapshots are persisted so a restart serves immediately.
+#
+# MANZI_FEEDS points at a JSON file such as
+#   {"financial_data": {"url": "http://billing:8080/export.parquet", "ttl_s": 900}}
+# Frames without a feed are served by the fallback source.
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+import pyarrow.feather as feather
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from data_sources import FRAME_COLUMNS, DataSource, prepare_table
+
+logger = logging.getLogger(__name__)
+
+# Which upstream system publishes which frame, and how often it changes
+FEED_SYSTEMS = {
+    'financial_data': 'billing',
+    'iot_data': 'scada',
+    'water_security': 'lims',
+    'customer_impact': 'crm',
+}
+DEFAULT_TTL_S = {
+    'financial_data': 3600,
+    'iot_data': 60,
+    'water_security': 900,
+    'customer_impact': 900,
+}
+# Past this age a snapshot is still served, but flagged as stale
+DEFAULT_MAX_STALE_S = 6 * 3600
+
+
+def parse_payload(body, content_type='', url=''):
+    # Parquet, Arrow IPC / Feather or JSON lines -> Arrow table
+    path = urlsplit(url).path
+    if 'parquet' in content_type or path.endswith('.parquet'):
+        return pq.read_table(io.BytesIO(body))
+    if 'arrow' in content_type or path.endswith(('.arrow', '.feather')):
+        return feather.read_table(io.BytesIO(body))
+    return pa_json.read_json(io.BytesIO(body))
+
+
+def validate_payload(name, body, content_type='', url=''):
+    # Parsed, conformed table, or ValueError if it lacks columns the tabs read
+    table = prepare_table(name, parse_payload(body, content_type, url))
+    missing = [column for column in FRAME_COLUMNS.get(name) or [] if column not in table.column_names]
+    if missing:
+        raise ValueError(f"{url} is missing {', '.join(missing)}")
+    return table
+
+
+class Snapshot:
+    """Last good copy of one feed."""
+
+    def __init__(self, table, fingerprint, fetched_at, etag=None):
+        self.table = table
+        self.fingerprint = fingerprint
+        self.fetched_at = fetched_at
+        self.etag = etag
+
+
+class Feed:
+    def __init__(self, name, url, ttl_s=None, max_stale_s=DEFAULT_MAX_STALE_S):
+        self.name = name
+        self.url = url
+        self.ttl_s = ttl_s if ttl_s is not None else DEFAULT_TTL_S.get(name, 900)
+        self.max_stale_s = max_stale_s
+        self.snapshot = None
+        self.checked_at = 0.0
+        self.next_due = 0.0
+        self.failures = 0
+        self.last_error = None
+        self.in_flight = False
+        # mtime of the persisted metadata the snapshot was restored from
+        self.restored_mtime = None
+
+
+class FeedScheduler:
+    """Runs the refresh loop on a daemon thread with its own event loop."""
+
+    def __init__(self, feeds, snapshot_dir, on_update=None, max_connections=16, timeout=30.0, tick_s=1.0):
+        self.feeds = {feed.name: feed for feed in feeds}
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.on_update = on_update
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.timeout = timeout
+        self.tick_s = tick_s
+        self.refreshes = 0
+        self.not_modified = 0
+        self.errors = 0
+        self._wake = None
+        self._client = None
+        self._loop = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        for feed in self.feeds.values():
+            self._restore(feed)
+
+    # Snapshot persistence: <name>.arrow plus <name>.json metadata
+    def _restore(self, feed):
+        data, meta = self.snapshot_dir / f'{feed.name}.arrow', self.snapshot_dir / f'{feed.name}.json'
+        if data.exists() and meta.exists():
+            mtime = meta.stat().st_mtime_ns
+            if mtime == feed.restored_mtime:
+                return
+            info = json.loads(meta.read_text())
+            feed.snapshot = Snapshot(feather.read_table(data, memory_map=True), info['fingerprint'], info['fetched_at'], info.get('etag'))
+            feed.checked_at = info['fetched_at']
+            feed.restored_mtime = mtime
+
+    def _persist(self, feed):
+        snapshot = feed.snapshot
+        data, meta = self.snapshot_dir / f'{feed.name}.arrow', self.snapshot_dir / f'{feed.name}.json'
+        feather.write_feather(snapshot.table, data.with_suffix('.tmp'), compression='uncompressed')
+        os.replace(data.with_suffix('.tmp'), data)
+        meta.write_text(json.dumps({'fingerprint': snapshot.fingerprint, 'fetched_at': snapshot.fetched_at, 'etag': snapshot.etag}))
+
+    def start(self):
+        threading.Thread(target=self._run, name='manzi-feeds', daemon=True).start()
+        return self
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._main())
+
+    async def _main(self):
+        self._wake = asyncio.Event()
+        async with httpx.AsyncClient(limits=self.limits, timeout=self.timeout) as self._client:
+            await self._schedule()
+
+    async def _schedule(self):
+        tasks = set()
+        while True:
+            now = time.time()
+            # Every due feed starts in the same batch; a slow upstream only
+            # delays its own feed, never the next tick
+            for feed in self.feeds.values():
+                if not feed.in_flight and feed.next_due <= now:
+                    feed.in_flight = True
+                    task = asyncio.create_task(self._refresh(feed))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if all(feed.snapshot is not None for feed in self.feeds.values()):
+                self._ready.set()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.tick_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _refresh(self, feed):
+        headers = {'Accept': 'application/vnd.apache.parquet, application/vnd.apache.arrow.file, application/json'}
+        if feed.snapshot is not None and feed.snapshot.etag:
+            headers['If-None-Match'] = feed.snapshot.etag
+        try:
+            response = await self._client.get(feed.url, headers=headers)
+            status, body = response.status_code, response.content
+            now = time.time()
+            if status == 304 and feed.snapshot is not None:
+                self.not_modified += 1
+            elif status == 200:
+                # Parsing, validation and cache priming stay off the event
+                # loop as well; a payload that fails any of them never
+                # replaces (or overwrites on disk) the last good snapshot
+                table = await asyncio.to_thread(validate_payload, feed.name, body, response.headers.get('content-type', ''), feed.url)
+                fingerprint = hashlib.sha1(body).hexdigest()[:16]
+                changed = feed.snapshot is None or feed.snapshot.fingerprint != fingerprint
+                with self._lock:
+                    feed.snapshot = Snapshot(table, fingerprint, now, response.headers.get('etag'))
+                await asyncio.to_thread(self._persist, feed)
+                if changed and self.on_update is not None:
+                    await asyncio.to_thread(self.on_update, feed.name)
+                self.refreshes += 1
+                self._wake.set()
+            else:
+                raise OSError(f'{feed.url} returned HTTP {status}')
+            feed.checked_at = now
+            feed.failures = 0
+            feed.last_error = None
+            feed.next_due = now + feed.ttl_s
+        except Exception as error:
+            # Keep serving the previous snapshot; retry with capped backoff
+            logger.warning('Refreshing feed %s failed: %s', feed.name, error, exc_info=True)
+            self.errors += 1
+            feed.failures += 1
+            feed.last_error = str(error)
+            feed.next_due = time.time() + min(feed.ttl_s, 5 * 2 ** min(feed.failures, 6))
+        finally:
+            feed.in_flight = False
+
+    def refresh_now(self, names=None):
+        for feed in self.feeds.values():
+            if names is None or feed.name in names:
+                feed.next_due = 0.0
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout) or all(feed.snapshot is not None for feed in self.feeds.values())
+
+    def snapshot(self, name):
+        with self._lock:
+            if self._loop is None:
+                # Never started (read-only export mode): follow the snapshots
+                # the live dashboard persists
+                self._restore(self.feeds[name])
+            return self.feeds[name].snapshot
+
+    def status(self):
+        now = time.time()
+        return [
+            {
+                'Feed': feed.name,
+                'System': FEED_SYSTEMS.get(feed.name, feed.name),
+                'Age_s': now - feed.snapshot.fetched_at if feed.snapshot else None,
+                'Checked_s_ago': now - feed.checked_at if feed.checked_at else None,
+                'Stale': feed.snapshot is None or now - feed.checked_at > feed.max_stale_s,
+                'Failures': feed.failures,
+                'Last_Error': feed.last_error,
+            }
+            for feed in self.feeds.values()
+        ]
+
+
+class FeedSource(DataSource):
+    """Backend serving feed snapshots; frames without a feed use `fallback`."""
+
+    def __init__(self, scheduler, fallback, cache=None):
+        super().__init__(cache)
+        self.scheduler = scheduler
+        self.fallback = fallback
+        # Called with the frame name after each changed snapshot is mapped
+        self.listeners = []
+        scheduler.on_update = self._updated
+
+    def _updated(self, name):
+        # Map the new snapshot into the Arrow cache on the refresh thread
+        self.table(name)
+        for listener in self.listeners:
+            listener(name)
+
+    def fingerprint(self, name):
+        if name not in self.scheduler.feeds:
+            return self.fallback.fingerprint(name)
+        snapshot = self.scheduler.snapshot(name)
+        return f"feed:{snapshot.fingerprint}" if snapshot is not None else self.fallback.fingerprint(name)
+
+    def read_table(self, name):
+        snapshot = self.scheduler.snapshot(name) if name in self.scheduler.feeds else None
+        if snapshot is None:
+            # No feed, or its first fetch has not landed yet
+            return self.fallback.read_table(name)
+        return snapshot.table
+
+    def invalidate(self):
+        super().invalidate()
+        self.scheduler.refresh_now()
+
+    def feed_status(self):
+        return self.scheduler.status()
+
+
+def load_feeds(config_path):
+    config = json.loads(Path(config_path).read_text())
+    return [
+        Feed(name, spec['url'], spec.get('ttl_s'), spec.get('max_stale_s', DEFAULT_MAX_STALE_S))
+        for name, spec in config.items()
+    ]
@@ -0,0 +1,115 @@
+# Memoized Plotly figures shared by every session
+#
+# Entries are keyed on a fingerprint of the input frames plus the builder's
+# parameters. A figure is serialized once, when it is built: the entry keeps
+# its JSON spec plus a stand-in figure whose to_dict() returns the parsed
+# spec. st.plotly_chart (checked against Streamlit 1.65) passes figures
+# through plotly.tools.return_figure_from_figure_or_data, which takes a
+# BaseFigure's to_dict() as already validated, so a cache hit skips Plotly's
+# validation and deep copy of every trace; Streamlit still re-encodes the
+# dict to JSON. tests/test_figure_cache.py pins that call path. The spec
+# size is what counts against the memory cap.
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def frame_fingerprint(*frames):
+    digest = hashlib.blake2b(digest_size=16)
+    for frame in frames:
+        if isinstance(frame, (pd.DataFrame, pd.Series)):
+            labels = list(frame.columns) if isinstance(frame, pd.DataFrame) else [frame.name]
+            digest.update(repr((frame.shape, labels)).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        else:
+            digest.update(repr(frame).encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _spec_figure_class():
+    # Defined on first use so importing this module does not load plotly
+    import plotly.graph_objects as go
+
+    class SpecFigure(go.Figure):
+        """Empty Figure whose dict form is a cached spec; all st.plotly_chart reads."""
+
+        def to_dict(self):
+            return self._spec
+
+        to_plotly_json = to_dict
+
+    return SpecFigure
+
+
+def spec_figure(spec):
+    figure = _spec_figure_class()()
+    figure._spec = json.loads(spec)
+    return figure
+
+
+class FigureCache:
+    """Thread-safe LRU cache of figures bounded by entry count and spec bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, builder, frames, params):
+        return (
+            f"{builder.__module__}.{builder.__qualname__}",
+            frame_fingerprint(*frames),
+            repr(sorted(params.items())),
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, fig, spec):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous[1])
+            self._entries[key] = (fig, spec)
+            self.total_bytes += len(spec)
+
+            while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, (_, evicted_spec) = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted_spec)
+
+    def build(self, key, builder, frames, params):
+        # Build outside the lock so slow charts don't serialize other sessions
+        spec = builder(*frames, **params).to_json()
+        entry = (spec_figure(spec), spec)
+        self.put(key, *entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,265 @@
+# Forecasting pipeline behind the 2030 Vision tab
+#
+# Every historical series (demand and leakage per zone, plus the city-wide
+# reservoir level, capital spend and population) gets a damped additive
+# Holt-Winters model with a 12-month season. Smoothing parameters are chosen
+# by one-step-ahead SSE over a grid, all grid points run as one vectorized
+# recursion. Large batches of full fits fan out over a long-lived process
+# pool, small ones run in-process; fitted models are kept
+# (and persisted) with their final state, so when new months arrive they are
+# only rolled forward with the existing parameters. A series is refitted in
+# full once a year of new data has accumulated or its history was revised.
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from schema import conform_frame
+
+SEASON = 12
+DAMPING = 0.98
+HORIZON_YEAR = 2030
+
+# New months absorbed by rolling forward before the parameters are refitted
+REFIT_EVERY = 12
+
+# Fewer full fits than this run in-process: a fit takes about a millisecond,
+# less than handing it to a worker
+PARALLEL_MIN_SERIES = 64
+
+ALPHAS = np.linspace(0.05, 0.95, 10)
+BETAS = np.array([0.01, 0.05, 0.1, 0.2, 0.3])
+GAMMAS = np.array([0.01, 0.05, 0.1, 0.2, 0.4])
+
+# Columns of the forecasting_data frame
+FORECAST_COLUMNS = ('Year', 'Demand_Projection_Ml', 'AI_Leakage_Prediction_%', 'Climate_Risk_Score',
+                    'CapEx_Projection_R', 'Population_Growth_%')
+
+# Forecast series: metric -> (frame, zone column or None for city-wide)
+SERIES = {
+    'Demand_Ml': ('zone_metrics', 'Zone'),
+    'Leakage_Ml': ('zone_metrics', 'Zone'),
+    'Reservoir_Capacity_%': ('water_security', None),
+    'CapEx_R': ('financial_data', None),
+    'Population_Served': ('customer_impact', None),
+}
+CITY = 'All'
+
+
+def _digest(values):
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()[:16]
+
+
+def _smooth(y, alpha, beta, gamma, level, trend, season, phase=0):
+    # Holt-Winters recursion over y for k parameter sets at once; alpha, beta,
+    # gamma, level, trend are (k,) and season is (k, SEASON). Returns the
+    # one-step SSE and the final state.
+    level, trend, season = level.copy(), trend.copy(), season.copy()
+    sse = np.zeros(len(alpha))
+    for t, value in enumerate(y):
+        p = (phase + t) % SEASON
+        expected = level + DAMPING * trend
+        sse += (value - expected - season[:, p]) ** 2
+        new_level = alpha * (value - season[:, p]) + (1 - alpha) * expected
+        trend = beta * (new_level - level) + (1 - beta) * DAMPING * trend
+        season[:, p] = gamma * (value - new_level) + (1 - gamma) * season[:, p]
+        level = new_level
+    return sse, level, trend, season
+
+
+def fit(values):
+    # Full fit of one monthly series -> model state dict
+    y = np.asarray(values, dtype=np.float64)
+    if len(y) >= 2 * SEASON:
+        level = y[:SEASON].mean()
+        trend = (y[SEASON:2 * SEASON].mean() - level) / SEASON
+        season = y[:SEASON] - level
+        grid = np.array(np.meshgrid(ALPHAS, BETAS, GAMMAS, indexing='ij')).reshape(3, -1)
+    else:
+        # Under two seasons: trend only
+        level = y[0] if len(y) else 0.0
+        trend = (y[-1] - y[0]) / (len(y) - 1) if len(y) > 1 else 0.0
+        season = np.zeros(SEASON)
+        grid = np.array(np.meshgrid(ALPHAS, BETAS, [0.0], indexing='ij')).reshape(3, -1)
+
+    k = grid.shape[1]
+    sse, levels, trends, seasons = _smooth(
+        y, *grid, np.full(k, level), np.full(k, trend), np.tile(season, (k, 1))
+    )
+    best = int(np.argmin(sse))
+    return {
+        'alpha': float(grid[0, best]),
+        'beta': float(grid[1, best]),
+        'gamma': float(grid[2, best]),
+        'level': float(levels[best]),
+        'trend': float(trends[best]),
+        'season': seasons[best].tolist(),
+        'rmse': float(np.sqrt(sse[best] / len(y))) if len(y) else 0.0,
+        'n_obs': len(y),
+        'fitted_obs': len(y),
+        'last_digest': _digest(y),
+    }
+
+
+def roll_forward(model, new_values):
+    # Absorb new months with the fitted parameters; no parameter search
+    y = np.asarray(new_values, dtype=np.float64)
+    params = [np.array([model[name]]) for name in ('alpha', 'beta', 'gamma')]
+    _, level, trend, season = _smooth(
+        y, *params, np.array([model['level']]), np.array([model['trend']]),
+        np.array([model['season']]), phase=model['n_obs'] % SEASON,
+    )
+    return {**model, 'level': float(level[0]), 'trend': float(trend[0]), 'season': season[0].tolist(),
+            'n_obs': model['n_obs'] + len(y)}
+
+
+def predict(model, steps):
+    h = np.arange(1, steps + 1)
+    damped = np.cumsum(DAMPING ** h)
+    phases = (model['n_obs'] + h - 1) % SEASON
+    return model['level'] + damped * model['trend'] + np.asarray(model['season'])[phases]
+
+
+def _fit_task(args):
+    key, values = args
+    return key, fit(values)
+
+
+def monthly_history(source):
+    # {(metric, zone): monthly Series indexed by Period}, gaps interpolated
+    history = {}
+    for frame_name in dict.fromkeys(frame for frame, _ in SERIES.values()):
+        metrics = [metric for metric, (frame, _) in SERIES.items() if frame == frame_name]
+        zone_column = SERIES[metrics[0]][1]
+        frame = source.load(frame_name, ['Date', *([zone_column] if zone_column else []), *metrics])
+        if frame.empty:
+            continue
+        months = pd.DatetimeIndex(frame['Date']).to_period('M')
+        zones = frame[zone_column].astype(str) if zone_column else pd.Series(CITY, index=frame.index)
+        grouped = frame[metrics].astype(np.float64).groupby([zones.to_numpy(), months]).mean()
+        for zone in grouped.index.get_level_values(0).unique():
+            monthly = grouped.loc[zone]
+            full = pd.period_range(monthly.index.min(), monthly.index.max(), freq='M')
+            monthly = monthly.reindex(full).interpolate().ffill().bfill()
+            for metric in metrics:
+                history[(metric, zone)] = monthly[metric]
+    return history
+
+
+class ForecastStore:
+    """Fitted models per (metric, zone), rolled forward as new months arrive."""
+
+    def __init__(self, path=None, workers=None):
+        self.path = Path(path) if path else None
+        self.workers = workers
+        self.models = {}
+        self.full_fits = 0
+        self.rolled = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        if self.path is not None and self.path.exists():
+            for entry in json.loads(self.path.read_text()):
+                self.models[(entry['metric'], entry['zone'])] = entry['model']
+
+    def update(self, history):
+        # Brings every model up to date with `history`; returns (full fits, rolled forward)
+        with self._lock:
+            refit, rolled = [], 0
+            for key, series in history.items():
+                values = series.to_numpy(dtype=np.float64)
+                model = self.models.get(key)
+                current = model is not None and model.get('start') == str(series.index[0])
+                if current and model['n_obs'] == len(values) and model['last_digest'] == _digest(values):
+                    self.reused += 1
+                elif (current and len(values) > model['n_obs']
+                      and len(values) - model['fitted_obs'] < REFIT_EVERY
+                      and model['last_digest'] == _digest(values[:model['n_obs']])):
+                    self.models[key] = {**roll_forward(model, values[model['n_obs']:]), 'last_digest': _digest(values)}
+                    rolled += 1
+                else:
+                    refit.append((key, values))
+
+            if refit:
+                workers = self.workers or os.cpu_count() or 1
+                if workers > 1 and len(refit) >= PARALLEL_MIN_SERIES:
+                    fitted = list(self._executor(workers).map(_fit_task, refit, chunksize=-(-len(refit) // workers)))
+                else:
+                    fitted = [_fit_task(task) for task in refit]
+                self.models.update(fitted)
+
+            for key, series in history.items():
+                self.models[key]['start'] = str(series.index[0])
+            self.full_fits += len(refit)
+            self.rolled += rolled
+            if (refit or rolled) and self.path is not None:
+                self._persist()
+        return len(refit), rolled
+
+    def _executor(self, workers):
+        # Created once and kept for the store's lifetime. Workers are spawned,
+        # not forked: a fork of the threaded server can inherit a held lock
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        return self._pool
+
+    def _persist(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entries = [{'metric': metric, 'zone': zone, 'model': model} for (metric, zone), model in self.models.items()]
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, self.path)
+
+    def forecast(self, key, series, until):
+        # Actual months of `series` followed by the forecast up to period `until`
+        steps = max(0, (until - series.index[-1]).n)
+        future = pd.period_range(series.index[-1] + 1, periods=steps, freq='M')
+        return pd.concat([series, pd.Series(predict(self.models[key], steps), index=future)])
+
+    def stats(self):
+        return {'hits': self.reused + self.rolled, 'misses': self.full_fits}
+
+
+def build_forecast(store, source, horizon_year=HORIZON_YEAR):
+    # The forecasting_data frame: one row per year from the first year with
+    # forecast months through horizon_year
+    history = monthly_history(source)
+    if not history:
+        # Nothing to fit yet (every source frame is empty)
+        empty = pd.DataFrame({column: pd.Series(dtype=np.int64 if column == 'Year' else np.float64) for column in FORECAST_COLUMNS})
+        return conform_frame('forecasting_data', empty)
+    store.update(history)
+    last = max(series.index[-1] for series in history.values())
+    first_year = last.year + 1 if last.month == 12 else last.year
+    until = pd.Period(f'{max(horizon_year, first_year)}-12', freq='M')
+
+    def annual(metric, how='sum'):
+        series = [store.forecast(key, values, until) for key, values in history.items() if key[0] == metric]
+        if not series:
+            return pd.Series(dtype=np.float64)
+        combined = pd.concat(series, axis=1).sum(axis=1) if how == 'sum' else pd.concat(series, axis=1).mean(axis=1)
+        combined = combined.clip(lower=0)
+        return getattr(combined.groupby(combined.index.year), how)()
+
+    demand = annual('Demand_Ml')
+    leakage = annual('Leakage_Ml')
+    reservoir = annual('Reservoir_Capacity_%', 'mean')
+    population = annual('Population_Served', 'mean')
+    years = np.arange(first_year, until.year + 1)
+
+    forecasting_data = pd.DataFrame({
+        'Year': years,
+        'Demand_Projection_Ml': demand.reindex(years).to_numpy(),
+        'AI_Leakage_Prediction_%': (leakage / (demand + leakage) * 100).reindex(years).to_numpy(),
+        # Drawn-down reservoirs leave less buffer against drought: 0 (full) to 10 (empty)
+        'Climate_Risk_Score': (10 * (1 - reservoir.clip(upper=100) / 100)).reindex(years).to_numpy(),
+        'CapEx_Projection_R': annual('CapEx_R').reindex(years).to_numpy(),
+        'Population_Growth_%': (population.pct_change() * 100).reindex(years).to_numpy(),
+    })
+    return conform_frame('forecasting_data', forecasting_data)
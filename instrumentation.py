@@ -0,0 +1,204 @@
+# Per-section timing, payload and cache counters
+#
+# One Profiler per server process collects how long each dashboard section
+# takes (data load, data prep, figure builds, chart / table serialization),
+# how many bytes each element sends to the browser and cache hit rates. It is
+# read by the hidden admin sidebar panel, served as Prometheus text on
+# MANZI_METRICS_PORT (loopback only unless MANZI_METRICS_HOST says otherwise)
+# and, with MANZI_PROFILE_LOG set, logged one JSON line per rerun.
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+
+
+class SectionStats:
+    """Running call count / total / max / last duration of one section."""
+
+    __slots__ = ('calls', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+
+class Profiler:
+    """Thread-safe counters shared by every session in the process."""
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.sections = {}
+        self.payload_bytes = {}
+        self.payload_count = {}
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self.cache_sources = {}
+        self.started = time.time()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def section(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        with self._lock:
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = SectionStats()
+            stats.add(seconds)
+        run = getattr(self._local, 'run', None)
+        if run is not None:
+            run[name] = run.get(name, 0.0) + seconds
+
+    def payload(self, name, n_bytes):
+        with self._lock:
+            self.payload_bytes[name] = self.payload_bytes.get(name, 0) + n_bytes
+            self.payload_count[name] = self.payload_count.get(name, 0) + 1
+
+    def cache(self, name, hit):
+        with self._lock:
+            counts = self.cache_hits if hit else self.cache_misses
+            counts[name] = counts.get(name, 0) + 1
+
+    @contextmanager
+    def cached(self, name):
+        # Wraps a call to a st.cache_* function whose body calls miss()
+        self._local.hit = True
+        try:
+            yield
+        finally:
+            self.cache(name, self._local.hit)
+
+    def miss(self):
+        self._local.hit = False
+
+    def add_cache_source(self, name, stats):
+        # stats() -> dict with 'hits' and 'misses', e.g. FigureCache.stats
+        self.cache_sources[name] = stats
+
+    def begin_run(self):
+        self._local.run = {}
+        self._local.run_started = time.perf_counter()
+
+    def end_run(self, **labels):
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            return
+        total = time.perf_counter() - self._local.run_started
+        self._local.run = None
+        self.record('rerun', total)
+        if self.log_path:
+            line = json.dumps({'ts': time.time(), **labels, 'total_s': round(total, 6),
+                               'sections': {name: round(seconds, 6) for name, seconds in run.items()}}, ensure_ascii=False)
+            with self._lock, open(self.log_path, 'a', encoding='utf-8') as log:
+                log.write(line + '\n')
+
+    def cache_counts(self):
+        with self._lock:
+            counts = {name: (self.cache_hits.get(name, 0), self.cache_misses.get(name, 0))
+                      for name in self.cache_hits.keys() | self.cache_misses.keys()}
+        for name, stats in self.cache_sources.items():
+            values = stats()
+            counts[name] = (values['hits'], values['misses'])
+        return counts
+
+    def section_table(self):
+        with self._lock:
+            rows = [(name, s.calls, s.total, s.total / s.calls * 1000, s.max * 1000, s.last * 1000)
+                    for name, s in self.sections.items()]
+        table = pd.DataFrame(rows, columns=['Section', 'Calls', 'Total_s', 'Mean_ms', 'Max_ms', 'Last_ms'])
+        return table.sort_values('Total_s', ascending=False, ignore_index=True)
+
+    def payload_table(self):
+        with self._lock:
+            rows = [(name, self.payload_count[name], total, total / self.payload_count[name] / 1024)
+                    for name, total in self.payload_bytes.items()]
+        table = pd.DataFrame(rows, columns=['Element', 'Sends', 'Total_bytes', 'Mean_KB'])
+        return table.sort_values('Total_bytes', ascending=False, ignore_index=True)
+
+    def cache_table(self):
+        rows = [(name, hits, misses, hits / (hits + misses) * 100 if hits + misses else float('nan'))
+                for name, (hits, misses) in sorted(self.cache_counts().items())]
+        return pd.DataFrame(rows, columns=['Cache', 'Hits', 'Misses', 'Hit_rate_%'])
+
+    def reset(self):
+        with self._lock:
+            self.sections.clear()
+            self.payload_bytes.clear()
+            self.payload_count.clear()
+            self.cache_hits.clear()
+            self.cache_misses.clear()
+            self.started = time.time()
+
+    def prometheus(self):
+        def escape(label):
+            return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines = [
+            '# HELP manzi_section_seconds Time spent in each dashboard section.',
+            '# TYPE manzi_section_seconds summary',
+        ]
+        with self._lock:
+            sections = {name: (s.calls, s.total, s.max) for name, s in self.sections.items()}
+            payloads = dict(self.payload_bytes)
+        for name, (calls, total, _) in sorted(sections.items()):
+            lines.append(f'manzi_section_seconds_sum{{section="{escape(name)}"}} {total:.6f}')
+            lines.append(f'manzi_section_seconds_count{{section="{escape(name)}"}} {calls}')
+        lines += ['# HELP manzi_section_seconds_max Slowest single call of each section.',
+                  '# TYPE manzi_section_seconds_max gauge']
+        lines += [f'manzi_section_seconds_max{{section="{escape(name)}"}} {longest:.6f}'
+                  for name, (_, _, longest) in sorted(sections.items())]
+        lines += ['# HELP manzi_payload_bytes_total Bytes serialized to the browser per element.',
+                  '# TYPE manzi_payload_bytes_total counter']
+        lines += [f'manzi_payload_bytes_total{{element="{escape(name)}"}} {total}'
+                  for name, total in sorted(payloads.items())]
+        counts = sorted(self.cache_counts().items())
+        lines += ['# HELP manzi_cache_hits_total Cache hits.', '# TYPE manzi_cache_hits_total counter']
+        lines += [f'manzi_cache_hits_total{{cache="{escape(name)}"}} {hits}' for name, (hits, _) in counts]
+        lines += ['# HELP manzi_cache_misses_total Cache misses.', '# TYPE manzi_cache_misses_total counter']
+        lines += [f'manzi_cache_misses_total{{cache="{escape(name)}"}} {misses}' for name, (_, misses) in counts]
+        return '\n'.join(lines) + '\n'
+
+
+def start_metrics_server(profiler, port, host='127.0.0.1'):
+    # Prometheus text exposition on http://host:port/metrics
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = profiler.prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='manzi-metrics', daemon=True).start()
+    return server
+
+
+def table_bytes(frame):
+    # Size of the Arrow payload st.dataframe sends for `frame`
+    return pa.Table.from_pandas(frame, preserve_index=False).nbytes
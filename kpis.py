@@ -0,0 +1,108 @@
+# Vectorized KPI engine
+#
+# Headline, per-zone and per-station KPIs are computed as arrays: the latest
+# value of every measure plus its month-on-month and year-on-year change,
+# located with one searchsorted over (group, month) keys instead of loops.
+import numpy as np
+import pandas as pd
+
+# Headline measures, each computed from the frame that reports it
+HEADLINE_KPIS = {
+    'Water_Loss_Ml_Monthly': 'Water loss (Ml/month)',
+    'Revenue_Loss_R': 'Revenue loss (R)',
+    'System_Efficiency_%': 'System efficiency (%)',
+    'CSAT_Score': 'Customer satisfaction (/10)',
+    'Collection_Rate_%': 'Collection rate (%)',
+    'Energy_Costs_R': 'Energy costs (R)',
+    'Infrastructure_ROI_%': 'Infrastructure ROI (%)',
+}
+
+# SANS 241:2015 limits (RED outside) and operational targets (YELLOW outside)
+SANS_241_LIMITS = pd.DataFrame({
+    'Parameter': ['pH Levels', 'Turbidity', 'E.coli', 'Free Chlorine', 'Total Coliform'],
+    'Unit': ['pH units', 'NTU', 'count/100 mL', 'mg/L', 'count/100 mL'],
+    'Lower_Limit': [5.0, np.nan, np.nan, 0.2, np.nan],
+    'Upper_Limit': [9.7, 5.0, 0.0, 5.0, 10.0],
+    'Lower_Target': [6.5, np.nan, np.nan, 0.2, np.nan],
+    'Upper_Target': [8.5, 1.0, 0.0, 1.2, 5.0],
+})
+
+
+def compute_kpis(frame, columns, date_column='Date', group_column=None):
+    # Latest value per column (and group) with MoM / YoY % change
+    dates = frame[date_column]
+    dates = (dates if np.issubdtype(dates.dtype, np.datetime64) else pd.to_datetime(dates)).to_numpy()
+    # Rows without a date are skipped; masks instead of dropna, so the frame is never copied
+    valid = ~np.isnat(dates)
+    if not valid.any():
+        return pd.DataFrame(columns=[*([group_column] if group_column else []), 'KPI', 'Value', 'MoM_%', 'YoY_%', 'As_Of'])
+    dates = dates[valid]
+    if group_column is None:
+        groups = np.zeros(len(dates), dtype=np.int64)
+        labels = np.array([None])
+    else:
+        groups, labels = pd.factorize(frame[group_column][valid], sort=True)
+
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    keys = groups.astype(np.int64) * 1_000_000 + months
+    # Source frames are Date-sorted, so ungrouped keys usually need no sort
+    order = np.arange(len(keys)) if group_column is None and np.all(keys[1:] >= keys[:-1]) else np.argsort(keys, kind='stable')
+    keys = keys[order]
+    values = np.column_stack([frame[column].to_numpy(dtype=np.float64)[valid] for column in columns])[order]
+
+    # Last row of each group is its latest month
+    last = np.flatnonzero(np.r_[keys[1:] != keys[:-1], True])
+    last = last[np.r_[keys[last][1:] // 1_000_000 != keys[last][:-1] // 1_000_000, True]]
+    latest = values[last]
+
+    def change(months_back):
+        targets = keys[last] - months_back
+        positions = np.clip(np.searchsorted(keys, targets, side='right') - 1, 0, len(keys) - 1)
+        found = keys[positions] == targets
+        previous = np.where(found[:, None], values[positions], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (latest - previous) / np.abs(previous) * 100
+
+    mom, yoy = change(1), change(12)
+    result = pd.DataFrame({
+        'KPI': np.tile(columns, len(last)),
+        'Value': latest.ravel(),
+        'MoM_%': mom.ravel(),
+        'YoY_%': yoy.ravel(),
+        'As_Of': np.repeat(dates[order][last], len(columns)),
+    })
+    if group_column is not None:
+        result.insert(0, group_column, np.repeat(labels[groups[order][last]], len(columns)))
+    return result
+
+
+def headline_kpis(water_security, financial_data, customer_impact):
+    # The frames may end in different months, so each measure is keyed on its
+    # own frame's dates rather than a merge that pads the laggard with NaN
+    water = pd.DataFrame({
+        'Date': water_security['Date'],
+        'Water_Loss_Ml_Monthly': water_security['Water_Loss_Ml_Monthly'],
+        'System_Efficiency_%': 100 - water_security['Pipe_Leakage_Rate_%'],
+    })
+    financial = pd.DataFrame({
+        'Date': financial_data['Date'],
+        'Revenue_Loss_R': financial_data['Billing_Amount_R'] - financial_data['Revenue_Collected_R'],
+        **{column: financial_data[column] for column in ('Collection_Rate_%', 'Energy_Costs_R', 'Infrastructure_ROI_%')},
+    })
+    kpis = pd.concat([
+        compute_kpis(water, ['Water_Loss_Ml_Monthly', 'System_Efficiency_%']),
+        compute_kpis(financial, ['Revenue_Loss_R', 'Collection_Rate_%', 'Energy_Costs_R', 'Infrastructure_ROI_%']),
+        compute_kpis(customer_impact, ['CSAT_Score']),
+    ])
+    return kpis.set_index('KPI').loc[list(HEADLINE_KPIS)]
+
+
+def evaluate_compliance(readings):
+    # readings: Parameter + Current_Value (any number of rows, e.g. per station)
+    limits = readings.merge(SANS_241_LIMITS, on='Parameter', how='left')
+    values = limits['Current_Value'].to_numpy(dtype=np.float64)
+    # NaN limits compare False, i.e. "no bound on this side"
+    red = (values < limits['Lower_Limit'].to_numpy()) | (values > limits['Upper_Limit'].to_numpy())
+    yellow = (values < limits['Lower_Target'].to_numpy()) | (values > limits['Upper_Target'].to_numpy())
+    limits['Status'] = np.select([red, yellow], ['RED', 'YELLOW'], 'GREEN')
+    return limits
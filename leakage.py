@@ -0,0 +1,112 @@
+# Water balance and minimum-night-flow leakage analytics
+#
+# Station flow is held as a stations x 15-minute-slots float32 grid and
+# reduced in one vectorized pass, a block of stations at a time: inflow
+# volume, average flow and the minimum night flow (MNF) per station. MNF above the legitimate night use allowance
+# is leakage; zones compare their stations' inflow against metered
+# consumption for the non-revenue water balance.
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_MONTH = 30.4 * 24 * 60
+LITRES_PER_ML = 1_000_000
+
+# Local (SAST, UTC+2) hours over which night flow is averaged
+NIGHT_HOURS = (2, 4)
+UTC_OFFSET_S = 2 * 3600
+
+# Share of a station's average flow that is legitimate night use
+LEGIT_NIGHT_FRACTION = 0.15
+
+DEFAULT_COST_PER_ML = 17_500
+
+
+def l_min_to_ml_month(flow):
+    return flow * MINUTES_PER_MONTH / LITRES_PER_ML
+
+
+def flow_grid(timestamps, stations, flow, n_stations, interval_s=900.0):
+    # Long readings (timestamp, station index, L/min) -> (slot timestamps, stations x slots grid)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    start = np.floor(timestamps.min() / interval_s) * interval_s
+    slot = ((timestamps - start) // interval_s).astype(np.int64)
+    grid = np.full((n_stations, int(slot.max()) + 1), np.nan, dtype=np.float32)
+    grid[np.asarray(stations), slot] = flow
+    return start + np.arange(grid.shape[1]) * interval_s, grid
+
+
+def station_balance(timestamps, flow, interval_s=900.0, night_hours=NIGHT_HOURS,
+                    legit_night_fraction=LEGIT_NIGHT_FRACTION, chunk_rows=256):
+    # timestamps: epoch seconds per slot; flow: stations x slots grid of L/min,
+    # NaN where a reading is missing. Rows are reduced a block at a time so the
+    # float64 temporaries stay small however long the history is
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    n_stations = flow.shape[0]
+    local = timestamps + UTC_OFFSET_S
+    hour = (local % 86400) / 3600
+    night = np.flatnonzero((hour >= night_hours[0]) & (hour < night_hours[1]))
+    # Night slots grouped by calendar night, for one reduceat per block
+    night_day = (local[night] // 86400).astype(np.int64)
+    night_starts = np.flatnonzero(np.r_[True, night_day[1:] != night_day[:-1]]) if len(night) else np.zeros(0, dtype=np.int64)
+
+    count = np.zeros(n_stations)
+    total = np.zeros(n_stations)
+    mnf = np.full(n_stations, np.nan)
+    for begin in range(0, n_stations, chunk_rows):
+        block = flow[begin:begin + chunk_rows]
+        missing = np.isnan(block)
+        count[begin:begin + len(block)] = block.shape[1] - missing.sum(axis=1)
+        total[begin:begin + len(block)] = np.where(missing, 0, block).sum(axis=1, dtype=np.float64)
+        if not len(night):
+            continue
+
+        # Mean flow over each night window, then the quietest night per station
+        values = block[:, night]
+        present = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(present, values, 0), night_starts, axis=1, dtype=np.float64)
+        counts = np.add.reduceat(present, night_starts, axis=1, dtype=np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.inf)
+        quietest = means.min(axis=1)
+        mnf[begin:begin + len(block)] = np.where(np.isfinite(quietest), quietest, np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average = total / count
+    leak = np.clip(mnf - legit_night_fraction * average, 0, None)
+    return pd.DataFrame({
+        'Readings': count.astype(np.int64),
+        'Days': count * interval_s / 86400,
+        'Inflow_Ml': total * interval_s / 60 / LITRES_PER_ML,
+        'Avg_Flow_L_min': average,
+        'MNF_L_min': mnf,
+        'Leak_L_min': leak,
+        'Leakage_Ml': l_min_to_ml_month(leak),
+    })
+
+
+def zone_balance(balance, station_zones, metered_ml=None, cost_per_ml=DEFAULT_COST_PER_ML):
+    # Monthly water balance per zone; metered_ml: Series of billed Ml/month by zone
+    monthly = pd.DataFrame({
+        'Zone': np.asarray(station_zones),
+        'Inflow_Ml': l_min_to_ml_month(balance['Avg_Flow_L_min'].to_numpy()),
+        'Leakage_Ml': balance['Leakage_Ml'].to_numpy(),
+        'Stations': 1,
+    })
+    zones = monthly.groupby('Zone', observed=True).sum(min_count=1).reset_index()
+    if metered_ml is not None:
+        zones['Metered_Ml'] = zones['Zone'].map(metered_ml).astype(np.float64)
+        zones['NRW_Ml'] = zones['Inflow_Ml'] - zones['Metered_Ml']
+        zones['NRW_%'] = zones['NRW_Ml'] / zones['Inflow_Ml'] * 100
+    zones['Monthly_Loss_R'] = zones['Leakage_Ml'] * cost_per_ml
+    return zones
+
+
+def leak_candidates(balance, station_ids, station_zones, zones=None, cost_per_ml=DEFAULT_COST_PER_ML, limit=None):
+    # Stations ranked by estimated leakage, with the monthly Rand value lost
+    candidates = balance.assign(Station_ID=np.asarray(station_ids), Zone=np.asarray(station_zones))
+    candidates = candidates[candidates['Leakage_Ml'] > 0]
+    if zones is not None:
+        candidates = candidates[candidates['Zone'].isin(zones)]
+    candidates = candidates.nlargest(limit if limit is not None else len(candidates), 'Leakage_Ml')
+    candidates = candidates.assign(Monthly_Loss_R=candidates['Leakage_Ml'] * cost_per_ml)
+    return candidates[['Station_ID', 'Zone', 'MNF_L_min', 'Avg_Flow_L_min', 'Leakage_Ml', 'Monthly_Loss_R']].reset_index(drop=True)
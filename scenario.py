@@ -0,0 +1,158 @@
+# Monte Carlo engine for the 2030 Scenario Simulator
+#
+# Demand, climate (drought) and leakage paths are drawn as (paths x years)
+# arrays over the forecasting_data horizon, so a 100k-path run is a handful
+# of vectorized NumPy operations.
+import numpy as np
+import pandas as pd
+
+# Share of the projected leakage growth that remains at each investment level
+INVESTMENT_IMPACT = {
+    "Minimal (R30M)": 0.8,
+    "Moderate (R50M)": 0.6,
+    "Aggressive (R80M)": 0.3
+}
+
+CLIMATE_SEVERITIES = range(1, 11)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Supply headroom over the projected gross requirement before drought losses
+SUPPLY_HEADROOM = 0.25
+
+# Yearly shock sizes: demand growth (log scale) and leakage percentage points
+DEMAND_GROWTH_SD = 0.03
+LEAKAGE_SD = 0.8
+LEAKAGE_RANGE = (5, 60)
+
+# Chunked runs keep one histogram per year instead of every path
+HISTOGRAM_BINS = 4096
+
+
+def climate_multiplier(climate_severity):
+    return 1 + (climate_severity - 5) * 0.05
+
+
+def _draw_paths(base_demand, base_leakage, climate_severity, investment_impact, n_paths, seed):
+    rng = np.random.default_rng(seed)
+    n_years = len(base_demand)
+    shape = (n_paths, n_years)
+
+    # Demand: climate-adjusted projection with compounding growth shocks
+    growth = np.cumsum(rng.standard_normal(shape, dtype=np.float32) * np.float32(DEMAND_GROWTH_SD), axis=1)
+    demand = base_demand * np.float32(climate_multiplier(climate_severity)) * np.exp(growth)
+
+    # Leakage %: investment removes part of the projected rise, phased in over the horizon
+    phase_in = np.linspace(1 / n_years, 1, n_years, dtype=np.float32)
+    leakage = base_leakage * (1 - (1 - investment_impact) * 0.5 * phase_in)
+    leakage = leakage + np.cumsum(rng.standard_normal(shape, dtype=np.float32) * np.float32(LEAKAGE_SD), axis=1)
+    np.clip(leakage, *LEAKAGE_RANGE, out=leakage)
+
+    # Climate: drought years cut available supply; severity scales frequency and depth
+    severity = np.float32(climate_severity / 10)
+    drought = rng.random(shape, dtype=np.float32)
+    supply_loss = np.where(drought < 0.5 * severity, np.sqrt(drought) * severity * np.float32(0.25), np.float32(0))
+
+    supply = base_demand / (1 - base_leakage / 100) * np.float32(1 + SUPPLY_HEADROOM) * (1 - supply_loss)
+    gross_requirement = demand / (1 - leakage / 100)
+    failed = (gross_requirement > supply).any(axis=1)
+    return demand, leakage, failed
+
+
+def _bands(years, percentiles):
+    bands = pd.DataFrame(percentiles, columns=[f"P{p}" for p in PERCENTILES])
+    bands.insert(0, 'Year', years)
+    return bands
+
+
+def _summarize(years, demand, leakage, failed):
+    return {
+        'demand': _bands(years, np.percentile(demand, PERCENTILES, axis=0).T),
+        'leakage': _bands(years, np.percentile(leakage, PERCENTILES, axis=0).T),
+        'failure_probability': float(failed.mean() * 100),
+        'paths': len(failed),
+    }
+
+
+def _bin_edges(base_demand, climate_severity):
+    # Per-year edges wide enough for every draw: demand spans +-10 sd of its
+    # compounded growth, leakage its clip range
+    n_years = len(base_demand)
+    spread = 10 * DEMAND_GROWTH_SD * np.sqrt(np.arange(1, n_years + 1))
+    centre = base_demand.astype(np.float64) * climate_multiplier(climate_severity)
+    demand = centre[:, None] * np.exp(np.linspace(-spread, spread, HISTOGRAM_BINS + 1, axis=1))
+    leakage = np.tile(np.linspace(*LEAKAGE_RANGE, HISTOGRAM_BINS + 1), (n_years, 1))
+    return demand, leakage
+
+
+def _accumulate(counts, values, edges):
+    # Add one chunk's (paths x years) values to the (years x bins) counts;
+    # anything past the edges lands in the outer bins
+    for year in range(counts.shape[0]):
+        index = np.searchsorted(edges[year], values[:, year], side='right') - 1
+        np.clip(index, 0, HISTOGRAM_BINS - 1, out=index)
+        counts[year] += np.bincount(index, minlength=HISTOGRAM_BINS)
+
+
+def _histogram_percentiles(counts, edges):
+    # (years x PERCENTILES), interpolating linearly inside the bin holding each rank
+    result = np.empty((counts.shape[0], len(PERCENTILES)))
+    for year in range(counts.shape[0]):
+        cumulative = np.cumsum(counts[year])
+        ranks = np.asarray(PERCENTILES) / 100 * cumulative[-1]
+        bins = np.minimum(np.searchsorted(cumulative, ranks, side='left'), HISTOGRAM_BINS - 1)
+        before = np.where(bins > 0, cumulative[bins - 1], 0)
+        within = (ranks - before) / np.maximum(counts[year, bins], 1)
+        result[year] = edges[year, bins] + within * (edges[year, bins + 1] - edges[year, bins])
+    return result
+
+
+def _inputs(forecasting_data):
+    years = forecasting_data['Year'].to_numpy()
+    base_demand = forecasting_data['Demand_Projection_Ml'].to_numpy(dtype=np.float32)
+    base_leakage = forecasting_data['AI_Leakage_Prediction_%'].to_numpy(dtype=np.float32)
+    return years, base_demand, base_leakage
+
+
+def simulate(forecasting_data, climate_severity, investment_impact, n_paths=100_000, seed=0):
+    years, base_demand, base_leakage = _inputs(forecasting_data)
+    demand, leakage, failed = _draw_paths(base_demand, base_leakage, climate_severity, investment_impact, n_paths, seed)
+    return _summarize(years, demand, leakage, failed)
+
+
+def simulate_chunked(forecasting_data, climate_severity, investment_impact, n_paths=1_000_000,
+                     chunk_paths=250_000, seed=0):
+    # Large runs are drawn a chunk at a time in-process, each chunk from an
+    # independent RNG stream, and folded into per-year histograms and a
+    # failure count, so peak memory is one chunk's paths however many are run
+    years, base_demand, base_leakage = _inputs(forecasting_data)
+    n_chunks = -(-n_paths // chunk_paths)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    demand_edges, leakage_edges = _bin_edges(base_demand, climate_severity)
+    demand_counts = np.zeros((len(years), HISTOGRAM_BINS), dtype=np.int64)
+    leakage_counts = np.zeros((len(years), HISTOGRAM_BINS), dtype=np.int64)
+    failures = 0
+    for i, chunk_seed in enumerate(seeds):
+        size = min(chunk_paths, n_paths - i * chunk_paths)
+        demand, leakage, failed = _draw_paths(base_demand, base_leakage, climate_severity, investment_impact, size, chunk_seed)
+        _accumulate(demand_counts, demand, demand_edges)
+        _accumulate(leakage_counts, leakage, leakage_edges)
+        failures += int(failed.sum())
+
+    return {
+        'demand': _bands(years, _histogram_percentiles(demand_counts, demand_edges)),
+        'leakage': _bands(years, _histogram_percentiles(leakage_counts, leakage_edges)),
+        'failure_probability': failures / n_paths * 100,
+        'paths': n_paths,
+    }
+
+
+def scenario_grid(forecasting_data, n_paths=100_000, seed=0):
+    # Every slider combination, precomputed so the simulator only does lookups;
+    # impact 1.0 is the no-intervention baseline
+    levels = {**INVESTMENT_IMPACT, None: 1.0}
+    return {
+        (severity, level): simulate(forecasting_data, severity, impact, n_paths, seed)
+        for severity in CLIMATE_SEVERITIES
+        for level, impact in levels.items()
+    }
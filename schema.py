@@ -0,0 +1,138 @@
+# Compact column dtypes for every dashboard frame
+#
+# Applied once when a frame is written to the Arrow cache or the archive:
+# zones, statuses and station IDs become dictionary-encoded categoricals with
+# the narrowest index that fits, sensor readings and percentages float32,
+# counts integers (null where the source has gaps). Rand amounts stay
+# float64 so monthly totals keep cent precision. Columns not listed keep
+# whatever dtype the source delivered. Frames that are only built in memory
+# (forecasting_data) get the numeric types but not the categoricals, which
+# only pay off in persisted, memory-mapped frames.
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+SCHEMAS = {
+    'water_security': {
+        'Reservoir_Capacity_%': 'float32',
+        'Drought_Status': 'category',
+        'Pump_Downtime_Hours': 'float32',
+        'Pipe_Leakage_Rate_%': 'float32',
+        'Water_Loss_Ml_Monthly': 'float32',
+        'Borehole_Active_Count': 'int16',
+        'Quality_Tests_Passed_%': 'float32',
+    },
+    'financial_data': {
+        'Load_Shedding_Hours': 'float32',
+        'Infrastructure_ROI_%': 'float32',
+        'Collection_Rate_%': 'float32',
+    },
+    'customer_impact': {
+        'Service_Interruptions_Count': 'int32',
+        'Avg_Downtime_Hours': 'float32',
+        'SANS241_Compliance_%': 'float32',
+        'CSAT_Score': 'float32',
+        'Complaints_Count': 'int32',
+        'Zone_Most_Affected': 'category',
+        'Population_Served': 'int32',
+    },
+    'forecasting_data': {
+        'Year': 'int16',
+        'Demand_Projection_Ml': 'float32',
+        'AI_Leakage_Prediction_%': 'float32',
+        'Climate_Risk_Score': 'float32',
+        'Population_Growth_%': 'float32',
+    },
+    'iot_data': {
+        'Station_ID': 'category',
+        'Location': 'category',
+        'Status': 'category',
+        'Flow_Rate_L_min': 'float32',
+        'Pressure_kPa': 'float32',
+        'Temperature_C': 'float32',
+        'pH_Level': 'float32',
+        'Chlorine_mg_L': 'float32',
+    },
+    'zone_metrics': {
+        'Zone': 'category',
+        'Demand_Ml': 'float32',
+        'Leakage_Ml': 'float32',
+    },
+}
+
+ARROW_TYPES = {
+    'float32': pa.float32(),
+    'float64': pa.float64(),
+    'int16': pa.int16(),
+    'int32': pa.int32(),
+}
+
+
+def _index_type(n_categories):
+    for index_type in (pa.int8(), pa.int16()):
+        if n_categories <= np.iinfo(index_type.to_pandas_dtype()).max:
+            return index_type
+    return pa.int32()
+
+
+def _cast_column(column, dtype):
+    column = column.combine_chunks()
+    if dtype == 'category':
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        return column.cast(pa.dictionary(_index_type(len(column.dictionary)), column.type.value_type))
+    target = ARROW_TYPES[dtype]
+    if pa.types.is_integer(target) and pa.types.is_floating(column.type):
+        # NaN has no integer value; it becomes null
+        column = pc.round(pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column))
+    return column.cast(target)
+
+
+def conform_table(name, table):
+    # Arrow table -> same table with the frame's compact column types
+    table = table.unify_dictionaries().combine_chunks()
+    for column, dtype in SCHEMAS.get(name, {}).items():
+        if column in table.column_names:
+            index = table.column_names.index(column)
+            table = table.set_column(index, column, _cast_column(table.column(column), dtype))
+    return table
+
+
+def conform_frame(name, frame):
+    # pandas equivalent of conform_table for in-memory frames: numeric types
+    # only, and nullable Int* where an integer column has gaps
+    dtypes = {}
+    for column, dtype in SCHEMAS.get(name, {}).items():
+        if column not in frame.columns or dtype == 'category':
+            continue
+        if dtype.startswith('int'):
+            if frame[column].dtype.kind == 'f':
+                frame = frame.assign(**{column: frame[column].round()})
+            if frame[column].isna().any():
+                dtype = dtype.capitalize()
+        dtypes[column] = dtype
+    return frame.astype(dtypes)
+
+
+def widen(frame):
+    # The frame as generate_sample_data builds it: float64 numbers, object strings
+    wide = {}
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        elif values.dtype.kind in 'iuf':
+            values = values.astype(np.float64)
+        wide[column] = values
+    return pd.DataFrame(wide)
+
+
+def memory_report(frames):
+    # frames: {name: compact frame}; bytes before and after the schema
+    rows = []
+    for name, frame in frames.items():
+        compact = frame.memory_usage(deep=True, index=False).sum()
+        wide = widen(frame).memory_usage(deep=True, index=False).sum()
+        rows.append((name, len(frame), wide / 1024, compact / 1024, (1 - compact / wide) * 100 if wide else 0.0))
+    return pd.DataFrame(rows, columns=['Frame', 'Rows', 'Wide_KB', 'Compact_KB', 'Saving_%'])
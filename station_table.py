@@ -0,0 +1,67 @@
+# Server-side paginated station table
+#
+# Sorting, filtering and paging all happen on the telemetry store's
+# per-station arrays; only the visible page is turned into a DataFrame and
+# sent to the browser. Sort orders are argsorts cached per column:
+# Station_ID and Location never change; Status and the metrics are re-sorted
+# when the store has ingested new readings and the cached order is older
+# than max_age_s. Ingest bumps the store version several times a second, so
+# between re-sorts a page may be ordered by readings up to max_age_s old
+# (its values are always the latest).
+import threading
+import time
+
+import numpy as np
+
+from telemetry import METRICS
+
+STATIC_COLUMNS = ('Station_ID', 'Location')
+COLUMNS = ('Station_ID', 'Location', 'Status', *METRICS)
+
+
+class StationTable:
+    """Sorted, filtered, paged view over a TelemetryStore's latest readings."""
+
+    def __init__(self, store, max_age_s=5.0):
+        self.store = store
+        self.max_age_s = max_age_s
+        self._orders = {}
+        self._search_keys = np.char.upper(store.station_ids.astype(str))
+        self._lock = threading.Lock()
+
+    def order(self, column, descending=False):
+        # Row order for `column`; NaN readings sort last in either direction
+        with self._lock:
+            cached = self._orders.get(column)
+        now = time.monotonic()
+        if cached is None or (column not in STATIC_COLUMNS and cached[0] != self.store.version and now - cached[1] >= self.max_age_s):
+            values, version = self.store.column(column)
+            order = np.argsort(values, kind='stable')
+            valid = len(order) if values.dtype == object else int((~np.isnan(values)).sum())
+            cached = (version, now, order, valid)
+            with self._lock:
+                self._orders[column] = cached
+        _, _, order, valid = cached
+        if descending:
+            return np.concatenate((order[:valid][::-1], order[valid:]))
+        return order
+
+    def mask(self, locations=None, statuses=None, search='', ranges=None):
+        mask = np.ones(len(self.store.station_ids), dtype=bool)
+        if locations is not None:
+            mask &= np.isin(self.store.locations, list(locations))
+        if statuses is not None:
+            mask &= np.isin(self.store.column('Status')[0], list(statuses))
+        if search:
+            mask &= np.char.find(self._search_keys, search.strip().upper()) >= 0
+        for metric, (low, high) in (ranges or {}).items():
+            values = self.store.column(metric)[0]
+            mask &= (values >= low) & (values <= high)
+        return mask
+
+    def page(self, sort_by='Station_ID', descending=False, page=0, page_size=50, **filters):
+        # (rows of the requested page, number of matching stations)
+        order = self.order(sort_by, descending)
+        matching = order[self.mask(**filters)[order]]
+        start = page * page_size
+        return self.store.rows(matching[start:start + page_size]), len(matching)
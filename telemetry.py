@@ -0,0 +1,325 @@
+# Streaming IoT telemetry ingest
+#
+# Readings land in preallocated NumPy ring buffers (one per metric) with O(1)
+# append. A background ingestor thread pulls batches from a source: a tailed
+# JSON-lines file, a UDP socket, or the built-in simulator standing in for the
+# SCADA/MQTT feed.
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+
+METRICS = ('Flow_Rate_L_min', 'Pressure_kPa', 'pH_Level', 'Chlorine_mg_L', 'Temperature_C')
+
+STATUSES = ('ONLINE', 'MAINTENANCE', 'CRITICAL')
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """Fixed-capacity ring with O(1) append and contiguous window views."""
+
+    def __init__(self, capacity, dtype=np.float32):
+        self.capacity = capacity
+        # Every value is written twice so any window of up to `capacity`
+        # items is a single contiguous slice, even across the wrap point
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        i = self._next
+        self._data[i] = value
+        self._data[i + self.capacity] = value
+        self._next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def extend(self, values):
+        values = np.asarray(values)[-self.capacity:]
+        positions = (self._next + np.arange(len(values))) % self.capacity
+        self._data[positions] = values
+        self._data[positions + self.capacity] = values
+        self._next = (self._next + len(values)) % self.capacity
+        self.count = min(self.count + len(values), self.capacity)
+
+    def view(self, n=None):
+        # Oldest-to-newest, read-only and zero-copy; later appends overwrite it in place
+        n = self.count if n is None else min(n, self.count)
+        end = self._next + self.capacity
+        window = self._data[end - n:end].view()
+        window.flags.writeable = False
+        return window
+
+
+class StatusAggregator:
+    """Per-status and per-Location station counts, updated one event at a time."""
+
+    def __init__(self, locations, statuses):
+        self.locations = locations
+        self.status = np.asarray(statuses, dtype=object).copy()
+        self.counts = Counter()
+        self.by_location = defaultdict(Counter)
+        for station, status in enumerate(self.status):
+            self._add(station, status)
+
+    def _add(self, station, status):
+        location = self.locations[station]
+        self.counts[status] += 1
+        self.by_location[location][status] += 1
+
+    def _remove(self, station, status):
+        location = self.locations[station]
+        self.counts[status] -= 1
+        self.by_location[location][status] -= 1
+
+    def update(self, station, status):
+        previous = self.status[station]
+        if previous == status:
+            return False
+        self._remove(station, previous)
+        self.status[station] = status
+        self._add(station, status)
+        return True
+
+    def counts_for(self, locations=None):
+        if locations is None:
+            return {status: self.counts[status] for status in STATUSES}
+        return {status: sum(self.by_location[location][status] for location in locations) for status in STATUSES}
+
+
+class TelemetryStore:
+    """Ring buffers for the reading stream plus the latest value per station."""
+
+    def __init__(self, stations, capacity=262_144):
+        self.station_ids = stations['Station_ID'].to_numpy()
+        self.locations = stations['Location'].to_numpy()
+        self._station_index = pd.Index(self.station_ids)
+
+        self.timestamps = RingBuffer(capacity, np.float64)
+        self.stations = RingBuffer(capacity, np.int32)
+        self.readings = {metric: RingBuffer(capacity) for metric in METRICS}
+
+        self.latest = {metric: stations[metric].to_numpy(dtype=np.float32, copy=True) for metric in METRICS}
+        self.aggregator = StatusAggregator(self.locations, stations['Status'].to_numpy(dtype=object))
+        self.status = self.aggregator.status
+        self.last_seen = np.zeros(len(self.station_ids))
+
+        self.received = 0
+        self.version = 0
+        # Called with the store after every ingested batch (e.g. alert evaluation)
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def ingest(self, batch):
+        # batch: DataFrame with Station_ID, Timestamp and any of METRICS / Status
+        if batch is None or batch.empty:
+            return 0
+        index = self._station_index.get_indexer(batch['Station_ID'])
+        known = index >= 0
+        batch, index = batch[known], index[known]
+        if not len(index):
+            return 0
+
+        timestamps = batch['Timestamp'].to_numpy(dtype=np.float64) if 'Timestamp' in batch else np.full(len(index), time.time())
+        with self._lock:
+            self.timestamps.extend(timestamps)
+            self.stations.extend(index)
+            for metric in METRICS:
+                values = batch[metric].to_numpy(dtype=np.float32) if metric in batch else np.full(len(index), np.nan, np.float32)
+                self.readings[metric].extend(values)
+                has_value = ~np.isnan(values)
+                self.latest[metric][index[has_value]] = values[has_value]
+            if 'Status' in batch:
+                statuses = batch['Status'].to_numpy(dtype=object)
+                for station, status in zip(index, statuses):
+                    if isinstance(status, str):
+                        self.aggregator.update(station, status)
+            self.last_seen[index] = timestamps
+            self.received += len(index)
+            self.version += 1
+        for listener in self.listeners:
+            try:
+                listener(self)
+            except Exception:
+                # A failing listener must not hold back the others or the ingest
+                logger.exception("Telemetry listener %r failed", listener)
+        return len(index)
+
+    def latest_metrics(self):
+        with self._lock:
+            return {metric: values.copy() for metric, values in self.latest.items()}
+
+    def window(self, metric, n=None):
+        # Zero-copy (timestamps, station index, values) views over the last n readings
+        with self._lock:
+            return self.timestamps.view(n), self.stations.view(n), self.readings[metric].view(n)
+
+    def status_counts(self, locations=None):
+        with self._lock:
+            return self.aggregator.counts_for(locations)
+
+    def rows(self, index):
+        # Only the rows being displayed are gathered from the latest arrays
+        index = np.asarray(index, dtype=np.intp)
+        with self._lock:
+            return pd.DataFrame({
+                'Station_ID': self.station_ids[index],
+                'Location': self.locations[index],
+                'Status': self.status[index],
+                **{metric: values[index] for metric, values in self.latest.items()},
+            })
+
+    def column(self, name):
+        # (copy of one per-station column, store version it was read at)
+        with self._lock:
+            if name == 'Station_ID':
+                values = self.station_ids
+            elif name == 'Location':
+                values = self.locations
+            elif name == 'Status':
+                values = self.status.copy()
+            else:
+                values = self.latest[name].copy()
+            return values, self.version
+
+
+class FileTailSource:
+    """Follows a JSON-lines file, one reading per line."""
+
+    def __init__(self, path, from_start=False, chunk_bytes=16 * 1024 * 1024):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self._partial = b''
+        # Like tail -f: readings already in the file are history, not live
+        self._offset = 0
+        if not from_start:
+            try:
+                self._offset = os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+
+    def poll(self, max_records=50_000):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return None
+        if size < self._offset:
+            # File was truncated or rotated: start again from the top
+            self._offset, self._partial = 0, b''
+        with open(self.path, 'rb') as handle:
+            handle.seek(self._offset)
+            # Bounded per poll; a backlog drains over the following polls
+            data = handle.read(self.chunk_bytes)
+            self._offset = handle.tell()
+
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        records = [json.loads(line) for line in lines[-max_records:] if line.strip()]
+        return pd.DataFrame.from_records(records) if records else None
+
+
+class UdpSource:
+    """Receives JSON-lines datagrams on a local UDP socket."""
+
+    def __init__(self, host='127.0.0.1', port=9870):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, port))
+        self._socket.setblocking(False)
+
+    def poll(self, max_records=50_000):
+        records = []
+        while len(records) < max_records:
+            try:
+                payload, _ = self._socket.recvfrom(65_535)
+            except BlockingIOError:
+                break
+            records.extend(json.loads(line) for line in payload.splitlines() if line.strip())
+        return pd.DataFrame.from_records(records) if records else None
+
+
+class SimulatedSource:
+    """Random-walk readings for a fraction of the fleet on every poll."""
+
+    def __init__(self, stations, fraction=0.2, status_churn=0.01, seed=None):
+        self.stations = stations.reset_index(drop=True)
+        self.fraction = fraction
+        self.status_churn = status_churn
+        self._rng = np.random.default_rng(seed)
+        self._level = {metric: self.stations[metric].to_numpy(dtype=np.float32, copy=True) for metric in METRICS}
+        self._spread = {
+            'Flow_Rate_L_min': 15.0,
+            'Pressure_kPa': 8.0,
+            'pH_Level': 0.05,
+            'Chlorine_mg_L': 0.03,
+            'Temperature_C': 0.2,
+        }
+        self._bounds = {
+            'Flow_Rate_L_min': (0, 550),
+            'Pressure_kPa': (0, 280),
+            'pH_Level': (6.0, 9.0),
+            'Chlorine_mg_L': (0.0, 1.5),
+            'Temperature_C': (10, 30),
+        }
+
+    def poll(self, max_records=50_000):
+        n = min(max(1, int(len(self.stations) * self.fraction)), max_records)
+        index = self._rng.choice(len(self.stations), n, replace=False)
+        batch = {
+            'Station_ID': self.stations['Station_ID'].to_numpy()[index],
+            'Timestamp': np.full(n, time.time()),
+        }
+        for metric in METRICS:
+            low, high = self._bounds[metric]
+            level = self._level[metric]
+            level[index] = np.clip(level[index] + self._rng.normal(0, self._spread[metric], n), low, high)
+            batch[metric] = level[index]
+
+        # A few readings per batch carry a status change event
+        status = np.full(n, None, dtype=object)
+        changed = self._rng.random(n) < self.status_churn
+        status[changed] = self._rng.choice(STATUSES, changed.sum(), p=[0.75, 0.15, 0.10])
+        batch['Status'] = status
+        return pd.DataFrame(batch)
+
+
+class TelemetryIngestor(threading.Thread):
+    """Daemon thread moving batches from a source into a TelemetryStore."""
+
+    def __init__(self, store, source, interval=1.0):
+        super().__init__(name='telemetry-ingest', daemon=True)
+        self.store = store
+        self.source = source
+        self.interval = interval
+        self.errors = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.store.ingest(self.source.poll())
+            except Exception:
+                # A malformed batch or a failing source must not end the thread
+                self.errors += 1
+                logger.exception("Telemetry ingest from %s failed", type(self.source).__name__)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def get_telemetry_source(stations):
+    # MANZI_TELEMETRY_FILE / MANZI_TELEMETRY_UDP (host:port) select a live feed
+    path = os.environ.get('MANZI_TELEMETRY_FILE')
+    if path:
+        return FileTailSource(path)
+    address = os.environ.get('MANZI_TELEMETRY_UDP')
+    if address:
+        host, port = address.rsplit(':', 1)
+        return UdpSource(host, int(port))
+    return SimulatedSource(stations)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from alerts import STATION_RULES, AlertEngine, AlertRule
+
+
+def engine(cooldown_s=0.0):
+    rule = AlertRule('Low pressure', 'Pressure_kPa', low=50, hysteresis=10, severity='critical', message='{value:.0f}')
+    return AlertEngine([rule], ['A', 'B'], ['Midrand', 'Sandton'], cooldown_s=cooldown_s)
+
+
+def test_alert_holds_inside_the_hysteresis_band():
+    alerts = engine()
+    assert alerts.evaluate({'Pressure_kPa': np.array([40.0, 80.0])}, now=0) == 1
+    # Back above the limit but not by the hysteresis margin: still active
+    assert alerts.evaluate({'Pressure_kPa': np.array([55.0, 80.0])}, now=1) == 0
+    assert alerts.active[0].tolist() == [True, False]
+    alerts.evaluate({'Pressure_kPa': np.array([60.0, 80.0])}, now=2)
+    assert not alerts.active.any()
+
+
+def test_repeats_are_deduplicated_and_missing_readings_hold_state():
+    alerts = engine()
+    alerts.evaluate({'Pressure_kPa': np.array([40.0, 80.0])}, now=0)
+    assert alerts.evaluate({'Pressure_kPa': np.array([30.0, 80.0])}, now=1) == 0
+    assert alerts.evaluate({'Pressure_kPa': np.array([np.nan, 80.0])}, now=2) == 0
+    assert alerts.raised_total == 1
+    assert alerts.active_alerts(['Midrand'])['Entity'].tolist() == ['A']
+    assert alerts.active_alerts(['Sandton']).empty
+
+
+def test_cooldown_delays_re_arming():
+    alerts = engine(cooldown_s=300)
+    alerts.evaluate({'Pressure_kPa': np.array([40.0, 80.0])}, now=0)
+    alerts.evaluate({'Pressure_kPa': np.array([70.0, 80.0])}, now=10)
+    assert alerts.evaluate({'Pressure_kPa': np.array([40.0, 80.0])}, now=20) == 0
+    assert alerts.evaluate({'Pressure_kPa': np.array([40.0, 80.0])}, now=400) == 1
+
+
+def test_messages_follow_the_rule_limits():
+    rules = {rule.name: rule for rule in STATION_RULES}
+    assert rules['Low pressure'].format(42) == 'Pressure 42 kPa below 50 kPa'
+    assert rules['Chlorine out of range'].format(1.5) == 'Free chlorine 1.50 mg/L outside 0.2–1.2 mg/L'
+    assert rules['pH out of SANS 241 range'].format(10.2) == 'pH 10.20 outside SANS 241 5.0–9.7'
+    rule = AlertRule('Low pressure', 'Pressure_kPa', low=30, message=rules['Low pressure'].message)
+    assert rule.format(25) == 'Pressure 25 kPa below 30 kPa'
@@ -0,0 +1,48 @@
+import pandas as pd
+import pyarrow as pa
+
+from archive import Archive
+
+
+def monthly_frame():
+    dates = pd.date_range('2023-01-01', periods=6, freq='MS') + pd.offsets.MonthEnd(0)
+    return pd.DataFrame({'Date': dates, 'Water_Loss_Ml_Monthly': range(6)}).astype({'Water_Loss_Ml_Monthly': float})
+
+
+def test_prune_skips_parts_outside_the_window(tmp_path):
+    archive = Archive(tmp_path)
+    archive.append('water_security', monthly_frame())
+    selected = archive.prune('water_security', ('2023-02-01', '2023-03-31'))
+    assert [part['month'] for part, _ in selected] == ['2023-02', '2023-03']
+    assert all(inside for _, inside in selected)
+    assert archive.prune('water_security', ('2025-01-01', None)) == []
+
+
+def test_query_filters_boundary_parts_and_projects_columns(tmp_path):
+    archive = Archive(tmp_path)
+    archive.append('water_security', monthly_frame())
+    table = archive.query('water_security', ['Water_Loss_Ml_Monthly'], ('2023-03-15', '2023-05-31'))
+    assert table.column_names == ['Date', 'Water_Loss_Ml_Monthly']
+    assert table['Water_Loss_Ml_Monthly'].to_pylist() == [2.0, 3.0, 4.0]
+
+
+def test_prune_by_zone(tmp_path):
+    archive = Archive(tmp_path)
+    frame = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-31'] * 2), 'Zone': ['Midrand', 'Sandton'],
+        'Demand_Ml': [1.0, 2.0], 'Leakage_Ml': [0.1, 0.2], 'Monthly_Loss_R': [1.0, 2.0],
+    })
+    archive.append('zone_metrics', frame)
+    assert [part['zone'] for part, _ in archive.prune('zone_metrics', zones=['Sandton'])] == ['Sandton']
+    assert archive.max_date('zone_metrics') == pd.Timestamp('2024-01-31')
+
+
+def test_query_filters_microsecond_timestamps(tmp_path):
+    # Daily rows, so the boundary months need the row-level filter
+    archive = Archive(tmp_path)
+    dates = pd.date_range('2023-03-01', '2023-05-31', freq='D').astype('datetime64[us]')
+    archive.append('water_security', pd.DataFrame({'Date': dates, 'Water_Loss_Ml_Monthly': 1.0}))
+    table = archive.query('water_security', ['Water_Loss_Ml_Monthly'], ('2023-03-15', '2023-05-10'))
+    assert table['Date'].type == pa.timestamp('us')
+    assert table.num_rows == 57
+    assert table['Date'][0].as_py() == pd.Timestamp('2023-03-15')
@@ -0,0 +1,74 @@
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from data_sources import FrameCache, ParquetSource, SyntheticSource, derive_zone_metrics, generate_sample_data
+
+
+def test_frame_cache_round_trip_drops_older_versions(tmp_path):
+    cache = FrameCache(tmp_path)
+    table = pa.table({'Date': pd.date_range('2024-01-01', periods=3), 'Value': [1.0, 2.0, 3.0]})
+    assert cache.get('frame', 'v1') is None
+    cache.put('frame', 'v1', table)
+    assert cache.get('frame', 'v1').equals(table)
+    cache.put('frame', 'v2', table)
+    assert cache.get('frame', 'v1') is None
+    assert [path.name for path in tmp_path.iterdir()] == [cache.path('frame', 'v2').name]
+
+
+def test_cold_cache_loads_are_safe_across_threads(tmp_path):
+    source = SyntheticSource(cache=FrameCache(tmp_path))
+    errors, results = [], []
+
+    def load():
+        try:
+            results.append(len(source.load('zone_metrics')))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(set(results)) == 1
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_load_slices_by_date(tmp_path):
+    source = SyntheticSource(cache=FrameCache(tmp_path))
+    frame = source.load('zone_metrics', ['Date', 'Zone'], date_range=('2023-01-01', '2023-03-31'))
+    assert frame.columns.tolist() == ['Date', 'Zone']
+    assert frame['Date'].min() == pd.Timestamp('2023-01-31')
+    assert frame['Date'].max() == pd.Timestamp('2023-03-31')
+    assert len(frame) == 3 * frame['Zone'].nunique()
+    assert source.date_bounds('zone_metrics') == (pd.Timestamp('2022-01-31'), pd.Timestamp('2024-12-31'))
+
+
+def test_date_index_is_replaced_with_its_table(tmp_path):
+    source = SyntheticSource(cache=FrameCache(tmp_path))
+    source.load('water_security')
+    source.fingerprint = lambda name: 'restated'
+    source.read_table = lambda name: pa.table({'Date': pd.to_datetime(['2030-01-31']), 'Water_Loss_Ml_Monthly': [1.0]})
+    # A new fingerprint maps a new table and, with it, a new date index
+    assert source.date_bounds('water_security') == (pd.Timestamp('2030-01-31'), pd.Timestamp('2030-01-31'))
+    assert len(source.load('water_security', date_range=('2030-01-01', '2030-01-31'))) == 1
+    assert list(source._tables) == [('water_security', 'restated')]
+
+
+def test_parquet_source_derives_missing_zone_metrics(tmp_path):
+    frames = dict(zip(('water_security', 'financial_data', 'customer_impact', 'iot_data'), generate_sample_data()))
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for name, frame in frames.items():
+        frame.to_parquet(data_dir / f'{name}.parquet')
+    source = ParquetSource(data_dir, cache=FrameCache(tmp_path / 'cache'))
+
+    zone_metrics = source.load('zone_metrics')
+    expected = derive_zone_metrics(frames['water_security'], frames['iot_data'])
+    assert len(zone_metrics) == len(expected)
+    # Zone leakage adds back up to the city-wide monthly loss
+    monthly = zone_metrics.groupby('Date')['Leakage_Ml'].sum().to_numpy()
+    assert abs(monthly - frames['water_security']['Water_Loss_Ml_Monthly'].to_numpy()).max() < 1e-3
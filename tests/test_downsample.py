@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsample import bucket_means, downsample, lttb_indices
+
+
+def reference_lttb(x, y, threshold):
+    # Straight port of Steinarsson's reference implementation (2013)
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    sampled = [0]
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) * 0.5
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(best)
+        a = best
+    sampled.append(n - 1)
+    return sampled
+
+
+@pytest.mark.parametrize('n, n_out', [(1000, 100), (5003, 317), (250, 7)])
+def test_lttb_matches_the_reference_implementation(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 1e6, n))
+    y = np.cumsum(rng.standard_normal(n))
+    assert lttb_indices(x, y, n_out).tolist() == reference_lttb(x.tolist(), y.tolist(), n_out)
+
+
+def test_downsample_keeps_short_frames_and_the_endpoints():
+    frame = pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=500, freq='h'), 'y': np.arange(500.0)})
+    assert downsample(frame, 'Date', ['y'], 500) is frame
+    reduced = downsample(frame, 'Date', ['y'], 50)
+    assert len(reduced) == 50
+    assert reduced.index[0] == 0 and reduced.index[-1] == 499
+
+
+def test_bucket_means_average_consecutive_rows():
+    frame = pd.DataFrame({'x': np.arange(6.0), 'y': [1.0, 3.0, 5.0, 7.0, 9.0, 11.0]})
+    means = bucket_means(frame, 'x', ['y'], 3)
+    assert means['x'].tolist() == [0.5, 2.5, 4.5]
+    assert means['y'].tolist() == [2.0, 6.0, 10.0]
@@ -0,0 +1,110 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data_sources import FrameCache, SyntheticSource
+from feeds import Feed, FeedScheduler, FeedSource, Snapshot
+
+FRAME = pd.DataFrame({
+    'Date': pd.to_datetime(['2024-01-31', '2024-02-29']),
+    'Water_Loss_Ml_Monthly': [1.0, 2.0],
+    'Pipe_Leakage_Rate_%': [30.0, 31.0],
+})
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    body = b''
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/broken':
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+        elif self.path == '/malformed.jsonl':
+            # Parses, but lacks most of the columns the tabs read
+            body = b'{"Date": "2024-03-31", "Water_Loss_Ml_Monthly": 3.0}\n'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/vnd.apache.parquet')
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    buffer = io.BytesIO()
+    FRAME.to_parquet(buffer)
+    StubHandler.body = buffer.getvalue()
+    StubHandler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_scheduler_fetches_revalidates_and_keeps_snapshots_on_errors(server, tmp_path):
+    feeds = [Feed('water_security', f'{server}/water_security.parquet', ttl_s=0), Feed('financial_data', f'{server}/broken')]
+    scheduler = FeedScheduler(feeds, tmp_path / 'feeds', tick_s=0.05)
+    source = FeedSource(scheduler, fallback=SyntheticSource(cache=FrameCache(tmp_path / 'cache')), cache=FrameCache(tmp_path / 'cache'))
+    updated = []
+    source.listeners.append(updated.append)
+    scheduler.start()
+
+    for _ in range(100):
+        if scheduler.not_modified and scheduler.errors:
+            break
+        time.sleep(0.05)
+    assert scheduler.refreshes == 1 and scheduler.not_modified >= 1 and scheduler.errors >= 1
+    assert updated == ['water_security']
+    # Conditional requests carry the ETag of the last snapshot
+    assert ('/water_security.parquet', '"v1"') in StubHandler.requests
+
+    loaded = source.load('water_security')[FRAME.columns]
+    pd.testing.assert_frame_equal(loaded.astype({'Water_Loss_Ml_Monthly': float, 'Pipe_Leakage_Rate_%': float}), FRAME)
+    # The failed feed falls back to the underlying source and reports its error
+    assert len(source.load('financial_data')) == 36
+    status = {row['Feed']: row for row in scheduler.status()}
+    assert 'HTTP 500' in status['financial_data']['Last_Error']
+
+    # A new scheduler serves the persisted snapshot before any fetch
+    restored = FeedScheduler([Feed('water_security', f'{server}/water_security.parquet')], tmp_path / 'feeds')
+    assert restored.snapshot('water_security').etag == '"v1"'
+
+
+def test_malformed_payload_keeps_the_last_good_snapshot(server, tmp_path):
+    good = Snapshot(pa.Table.from_pandas(FRAME, preserve_index=False), 'good', time.time())
+    scheduler = FeedScheduler([Feed('water_security', f'{server}/malformed.jsonl', ttl_s=60)], tmp_path / 'feeds', tick_s=0.05)
+    scheduler.feeds['water_security'].snapshot = good
+    scheduler._persist(scheduler.feeds['water_security'])
+    meta = (tmp_path / 'feeds' / 'water_security.json').read_text()
+    scheduler.start()
+
+    for _ in range(100):
+        if scheduler.errors:
+            break
+        time.sleep(0.05)
+    assert scheduler.errors >= 1 and scheduler.refreshes == 0
+    assert scheduler.snapshot('water_security') is good
+    assert (tmp_path / 'feeds' / 'water_security.json').read_text() == meta
+    assert 'Pipe_Leakage_Rate_%' in scheduler.status()[0]['Last_Error']
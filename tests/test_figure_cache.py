@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+from streamlit.testing.v1 import AppTest
+
+from figure_cache import FigureCache
+
+
+def line_chart(frame, title=''):
+    return px.line(frame, x='x', y='y', title=title)
+
+
+def test_hits_serve_the_spec_built_on_the_miss():
+    cache = FigureCache()
+    frame = pd.DataFrame({'x': [1, 2, 3], 'y': [3.0, 1.0, 2.0]})
+    key = cache.key(line_chart, (frame,), {'title': 'Flow'})
+    assert cache.get(key) is None
+    figure, spec = cache.build(key, line_chart, (frame,), {'title': 'Flow'})
+    assert spec == line_chart(frame, title='Flow').to_json()
+    # What st.plotly_chart sends is the cached spec, byte for byte
+    assert pio.to_json(figure, validate=False) == spec
+    assert cache.get(key) == (figure, spec)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def cached_chart_app():
+    import streamlit as st
+
+    from figure_cache import spec_figure
+
+    # Plotly validation would reject the unknown property
+    st.plotly_chart(spec_figure('{"data": [{"type": "scatter", "y": [1, 2], "not_a_property": 1}], "layout": {}}'))
+
+
+def test_plotly_chart_sends_the_spec_without_validating_it():
+    # Pins the Streamlit call path the stand-in figure relies on: if
+    # st.plotly_chart starts validating or copying figures another way, the
+    # cached spec is no longer what reaches the browser
+    app = AppTest.from_function(cached_chart_app).run()
+    assert not app.exception
+    spec = json.loads(app.get('plotly_chart')[0].proto.spec)
+    assert spec == {'data': [{'type': 'scatter', 'y': [1, 2], 'not_a_property': 1}], 'layout': {}}
+
+
+def test_keys_follow_data_and_params():
+    cache = FigureCache()
+    frame = pd.DataFrame({'x': [1, 2], 'y': [1.0, 2.0]})
+    key = cache.key(line_chart, (frame,), {'title': 'a'})
+    assert key == cache.key(line_chart, (frame.copy(),), {'title': 'a'})
+    assert key != cache.key(line_chart, (frame,), {'title': 'b'})
+    assert key != cache.key(line_chart, (frame.assign(y=[1.0, 3.0]),), {'title': 'a'})
+
+
+def test_evicts_least_recently_used_past_the_byte_cap():
+    cache = FigureCache(max_bytes=25)
+    cache.put('a', None, '0123456789')
+    cache.put('b', None, '0123456789')
+    cache.get('a')
+    cache.put('c', None, '0123456789')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['bytes'] == 20
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from data_sources import FRAME_COLUMNS, FrameCache, SyntheticSource
+from forecasting import FORECAST_COLUMNS, REFIT_EVERY, ForecastStore, build_forecast, fit, predict
+
+
+def seasonal(months, start='2020-01'):
+    t = np.arange(months)
+    values = 100 + 0.5 * t + 10 * np.sin(2 * np.pi * t / 12)
+    return pd.Series(values, index=pd.period_range(start, periods=months, freq='M'))
+
+
+def test_fit_tracks_a_seasonal_series():
+    series = seasonal(48)
+    model = fit(series)
+    assert model['n_obs'] == model['fitted_obs'] == 48
+    expected = seasonal(60).to_numpy()[48:]
+    np.testing.assert_allclose(predict(model, 12), expected, rtol=0.05)
+
+
+def test_update_reuses_rolls_forward_and_refits(tmp_path):
+    store = ForecastStore(tmp_path / 'models.json', workers=1)
+    key = ('Demand_Ml', 'Midrand')
+    assert store.update({key: seasonal(36)}) == (1, 0)
+    assert store.update({key: seasonal(36)}) == (0, 0)
+    assert store.reused == 1
+
+    # New months roll the model forward with the fitted parameters
+    params = {name: store.models[key][name] for name in ('alpha', 'beta', 'gamma')}
+    assert store.update({key: seasonal(38)}) == (0, 1)
+    assert store.models[key]['n_obs'] == 38 and store.models[key]['fitted_obs'] == 36
+    assert {name: store.models[key][name] for name in params} == params
+
+    # A year of new months, or revised history, triggers a full fit
+    assert store.update({key: seasonal(36 + REFIT_EVERY)}) == (1, 0)
+    revised = seasonal(36 + REFIT_EVERY)
+    revised.iloc[0] += 5
+    assert store.update({key: revised}) == (1, 0)
+
+    # Models persist, so a new store starts from them
+    assert ForecastStore(tmp_path / 'models.json').update({key: revised}) == (0, 0)
+
+
+def test_build_forecast_runs_to_the_horizon(tmp_path):
+    source = SyntheticSource(cache=FrameCache(tmp_path))
+    forecast = build_forecast(ForecastStore(), source)
+    assert forecast.columns.tolist() == list(FORECAST_COLUMNS)
+    assert forecast['Year'].tolist() == list(range(2025, 2031))
+    assert not forecast['Demand_Projection_Ml'].isna().any()
+
+
+class EmptySource:
+    def load(self, name, columns=None):
+        return pd.DataFrame(columns=columns or FRAME_COLUMNS[name])
+
+
+def test_build_forecast_of_an_empty_history_is_empty():
+    forecast = build_forecast(ForecastStore(), EmptySource())
+    assert forecast.empty
+    assert forecast.columns.tolist() == list(FORECAST_COLUMNS)
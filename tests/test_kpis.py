@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from kpis import HEADLINE_KPIS, headline_kpis
+
+
+def monthly(periods, **columns):
+    dates = pd.date_range('2023-01-31', periods=periods, freq='ME')
+    return pd.DataFrame({'Date': dates, **{name: np.arange(1, periods + 1) * scale for name, scale in columns.items()}})
+
+
+def test_headline_kpis_use_each_frames_latest_month():
+    # water_security lags the billing export by a month
+    water = monthly(13, Water_Loss_Ml_Monthly=10.0, **{'Pipe_Leakage_Rate_%': 1.0})
+    financial = monthly(14, Billing_Amount_R=100.0, Revenue_Collected_R=90.0, Energy_Costs_R=5.0,
+                        **{'Collection_Rate_%': 1.0, 'Infrastructure_ROI_%': 0.5})
+    customer = monthly(12, CSAT_Score=0.5)
+
+    kpis = headline_kpis(water, financial, customer)
+    assert kpis.index.tolist() == list(HEADLINE_KPIS)
+    assert not kpis['Value'].isna().any()
+    assert kpis.loc['Water_Loss_Ml_Monthly', 'Value'] == 130.0
+    assert kpis.loc['System_Efficiency_%', 'Value'] == 87.0
+    assert kpis.loc['Water_Loss_Ml_Monthly', 'As_Of'] == pd.Timestamp('2024-01-31')
+    assert kpis.loc['Revenue_Loss_R', 'Value'] == 140.0
+    assert kpis.loc['Revenue_Loss_R', 'As_Of'] == pd.Timestamp('2024-02-29')
+    assert kpis.loc['CSAT_Score', 'As_Of'] == pd.Timestamp('2023-12-31')
+    # 13 months of water data: January 2024 against January 2023
+    assert kpis.loc['Water_Loss_Ml_Monthly', 'YoY_%'] == 1200.0
+    assert np.isnan(kpis.loc['CSAT_Score', 'YoY_%'])
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from scenario import simulate, simulate_chunked
+
+FORECAST = pd.DataFrame({
+    'Year': range(2025, 2031),
+    'Demand_Projection_Ml': np.linspace(800, 950, 6),
+    'AI_Leakage_Prediction_%': np.linspace(30, 36, 6),
+})
+
+
+def test_failure_probability_rises_with_climate_severity():
+    probabilities = [simulate(FORECAST, severity, 0.6, n_paths=20_000)['failure_probability'] for severity in (1, 5, 10)]
+    assert probabilities == sorted(probabilities)
+    assert probabilities[0] < probabilities[-1]
+
+
+def test_chunked_histograms_match_the_in_memory_percentiles():
+    exact = simulate(FORECAST, 7, 0.6, n_paths=200_000)
+    chunked = simulate_chunked(FORECAST, 7, 0.6, n_paths=200_000, chunk_paths=30_000)
+    assert chunked['paths'] == 200_000
+    for bands in ('demand', 'leakage'):
+        np.testing.assert_allclose(chunked[bands].drop(columns='Year'), exact[bands].drop(columns='Year'), rtol=0.01)
+    assert abs(chunked['failure_probability'] - exact['failure_probability']) < 0.5
+    # Reproducible for a given seed and chunk size
+    assert simulate_chunked(FORECAST, 7, 0.6, n_paths=50_000, chunk_paths=10_000)['failure_probability'] == \
+        simulate_chunked(FORECAST, 7, 0.6, n_paths=50_000, chunk_paths=10_000)['failure_probability']
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from schema import conform_frame, conform_table
+
+
+def test_conform_table_encodes_zones_and_nulls_missing_counts():
+    table = pa.table({
+        'Zone_Most_Affected': ['Midrand', 'Sandton', 'Midrand'],
+        'Complaints_Count': [3.4, np.nan, 5.6],
+        'CSAT_Score': [7.0, 8.0, 9.0],
+    })
+    conformed = conform_table('customer_impact', table)
+    assert conformed.schema.field('Zone_Most_Affected').type == pa.dictionary(pa.int8(), pa.string())
+    assert conformed.schema.field('Complaints_Count').type == pa.int32()
+    assert conformed['Complaints_Count'].to_pylist() == [3, None, 6]
+    assert conformed.schema.field('CSAT_Score').type == pa.float32()
+
+
+def test_conform_frame_keeps_strings_and_uses_nullable_ints():
+    frame = pd.DataFrame({
+        'Zone_Most_Affected': ['Midrand', 'Sandton'],
+        'Complaints_Count': [3.4, np.nan],
+        'Population_Served': [100.0, 200.0],
+    })
+    conformed = conform_frame('customer_impact', frame)
+    assert conformed['Zone_Most_Affected'].dtype == object
+    assert conformed['Complaints_Count'].dtype == 'Int32'
+    assert conformed['Complaints_Count'].isna().tolist() == [False, True]
+    assert conformed['Population_Served'].dtype == np.int32
+
+
+def test_forecasting_data_schema_covers_its_projections():
+    frame = pd.DataFrame({'Year': [2025.0], 'Demand_Projection_Ml': [900.0], 'CapEx_Projection_R': [1e9]})
+    conformed = conform_frame('forecasting_data', frame)
+    assert conformed.dtypes.astype(str).tolist() == ['int16', 'float32', 'float64']
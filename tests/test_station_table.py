@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from station_table import StationTable
+from telemetry import TelemetryStore
+
+
+def make_store():
+    return TelemetryStore(pd.DataFrame({
+        'Station_ID': ['MNZ003', 'MNZ001', 'MNZ002', 'MNZ004'],
+        'Location': ['Sandton', 'Midrand', 'Sandton', 'Soweto_North'],
+        'Status': ['ONLINE', 'CRITICAL', 'ONLINE', 'MAINTENANCE'],
+        'Flow_Rate_L_min': [30.0, 10.0, np.nan, 20.0],
+        'Pressure_kPa': 100.0, 'pH_Level': 7.0, 'Chlorine_mg_L': 0.5, 'Temperature_C': 20.0,
+    }), capacity=16)
+
+
+def test_order_sorts_nan_readings_last_in_both_directions():
+    table = StationTable(make_store())
+    assert table.order('Flow_Rate_L_min').tolist() == [1, 3, 0, 2]
+    assert table.order('Flow_Rate_L_min', descending=True).tolist() == [0, 3, 1, 2]
+    assert table.order('Station_ID').tolist() == [1, 2, 0, 3]
+
+
+def test_page_filters_sorts_and_counts():
+    table = StationTable(make_store())
+    rows, total = table.page('Flow_Rate_L_min', descending=True, page_size=1, locations=['Sandton', 'Midrand'])
+    assert total == 3
+    assert rows['Station_ID'].tolist() == ['MNZ003']
+    rows, total = table.page(search='mnz00', statuses=['ONLINE'], ranges={'Flow_Rate_L_min': (0.0, 50.0)})
+    assert total == 1 and rows['Station_ID'].tolist() == ['MNZ003']
+
+
+def test_order_is_resorted_on_the_coarser_clock():
+    store = make_store()
+    table = StationTable(store, max_age_s=3600)
+    table.order('Flow_Rate_L_min')
+    store.ingest(pd.DataFrame({'Station_ID': ['MNZ001'], 'Flow_Rate_L_min': [99.0]}))
+    # Within max_age_s the cached order is kept; the rows still show the new value
+    assert table.order('Flow_Rate_L_min').tolist() == [1, 3, 0, 2]
+    assert table.page('Flow_Rate_L_min', page_size=1)[0]['Flow_Rate_L_min'].tolist() == [99.0]
+
+    table.max_age_s = 0.0
+    assert table.order('Flow_Rate_L_min').tolist() == [3, 0, 1, 2]
+    # Station_ID and Location orders never change
+    assert table.order('Station_ID') is table.order('Station_ID')
@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from telemetry import FileTailSource, RingBuffer, TelemetryIngestor, TelemetryStore
+
+
+def test_ring_buffer_keeps_the_newest_values_in_order():
+    ring = RingBuffer(4)
+    for value in range(6):
+        ring.append(value)
+    assert ring.count == 4
+    np.testing.assert_array_equal(ring.view(), [2, 3, 4, 5])
+    np.testing.assert_array_equal(ring.view(2), [4, 5])
+
+
+def test_ring_buffer_extend_wraps_and_truncates():
+    ring = RingBuffer(5)
+    ring.extend([1, 2, 3])
+    ring.extend([4, 5, 6, 7])
+    np.testing.assert_array_equal(ring.view(), [3, 4, 5, 6, 7])
+    ring.extend(np.arange(10, 22))
+    np.testing.assert_array_equal(ring.view(), [17, 18, 19, 20, 21])
+
+
+def test_ring_buffer_view_is_read_only_and_zero_copy():
+    ring = RingBuffer(3)
+    ring.extend([1, 2, 3])
+    window = ring.view()
+    with pytest.raises(ValueError):
+        window[0] = 0
+    assert np.shares_memory(window, ring._data)
+
+
+def test_store_tracks_latest_values_and_status_counts():
+    stations = pd.DataFrame({
+        'Station_ID': ['A', 'B'], 'Location': ['Midrand', 'Sandton'], 'Status': ['ONLINE', 'ONLINE'],
+        'Flow_Rate_L_min': [1.0, 2.0], 'Pressure_kPa': [100.0, 100.0], 'pH_Level': [7.0, 7.0],
+        'Chlorine_mg_L': [0.5, 0.5], 'Temperature_C': [20.0, 20.0],
+    })
+    store = TelemetryStore(stations, capacity=8)
+    added = store.ingest(pd.DataFrame({
+        'Station_ID': ['B', 'unknown'], 'Timestamp': [1.0, 2.0], 'Flow_Rate_L_min': [9.0, 5.0], 'Status': ['CRITICAL', 'ONLINE'],
+    }))
+    assert added == 1
+    assert store.latest['Flow_Rate_L_min'].tolist() == [1.0, 9.0]
+    # A metric missing from the batch keeps its last value
+    assert store.latest['Pressure_kPa'].tolist() == [100.0, 100.0]
+    assert store.status_counts(['Sandton']) == {'ONLINE': 0, 'MAINTENANCE': 0, 'CRITICAL': 1}
+    timestamps, index, flow = store.window('Flow_Rate_L_min')
+    assert timestamps.tolist() == [1.0] and index.tolist() == [1] and flow.tolist() == [9.0]
+
+
+def test_file_tail_starts_at_the_end_and_reads_in_chunks(tmp_path):
+    path = tmp_path / 'readings.jsonl'
+    path.write_text('{"Station_ID": "old"}\n')
+    source = FileTailSource(str(path), chunk_bytes=32)
+    assert source.poll() is None
+    with open(path, 'a') as handle:
+        handle.write('{"Station_ID": "A1"}\n{"Station_ID": "A2"}\n{"Station_ID": "A3"')
+    assert source.poll()['Station_ID'].tolist() == ['A1']
+    assert source.poll()['Station_ID'].tolist() == ['A2']
+    with open(path, 'a') as handle:
+        handle.write('}\n')
+    assert source.poll()['Station_ID'].tolist() == ['A3']
+
+
+def test_ingestor_survives_source_and_listener_errors():
+    class FlakySource:
+        polls = 0
+
+        def poll(self):
+            self.polls += 1
+            if self.polls == 1:
+                raise RuntimeError('upstream hiccup')
+            return pd.DataFrame({'Station_ID': ['A'], 'Flow_Rate_L_min': [float(self.polls)]})
+
+    store = TelemetryStore(pd.DataFrame({
+        'Station_ID': ['A'], 'Location': ['Midrand'], 'Status': ['ONLINE'], 'Flow_Rate_L_min': [0.0],
+        'Pressure_kPa': [0.0], 'pH_Level': [7.0], 'Chlorine_mg_L': [0.5], 'Temperature_C': [20.0],
+    }), capacity=8)
+    seen = []
+    store.listeners.append(lambda updated: 1 / 0)
+    store.listeners.append(lambda updated: seen.append(updated.received))
+    ingestor = TelemetryIngestor(store, FlakySource(), interval=0.01)
+    ingestor.start()
+    deadline = time.time() + 5
+    while store.received < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    ingestor.stop()
+    assert ingestor.errors == 1
+    assert seen[:2] == [1, 2]